@@ -1,5 +1,6 @@
 """API route modules."""
 
+from app.api.auth import APIKeyMiddleware
 from app.api.routes import router
 
-__all__ = ["router"]
+__all__ = ["APIKeyMiddleware", "router"]
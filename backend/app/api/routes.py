@@ -5,17 +5,21 @@ returns extracted recipe data directly.
 """
 
 import asyncio
+import inspect
 import json
 import logging
-import secrets
-from collections.abc import AsyncGenerator
+import re
+from collections.abc import AsyncGenerator, Callable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from types import MappingProxyType
+from typing import Annotated
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, StringConstraints
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
-from fastapi.responses import StreamingResponse
-from fastapi.security import APIKeyHeader
-from pydantic import BaseModel, HttpUrl
-
-from app.config import get_settings
 from app.schemas import Recipe
 from app.services.extraction_pipeline import ExtractionPipeline
 from app.services.recipe_populator import RecipePopulator
@@ -24,36 +28,72 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["extraction"])
 
-# API key security
-_api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+# Max buffered progress updates per stream; when full, the oldest update that
+# doesn't switch tier is dropped
+_PROGRESS_QUEUE_SIZE = 64
+
+# Seconds without an event before a keep-alive comment is sent, so proxies
+# don't drop the connection during long transcription/vision runs
+_SSE_PING_INTERVAL = 15.0
+_SSE_PING = b": ping\n\n"
+
+# SSE frames are `<prefix><json data><suffix>`; the event types are fixed,
+# so each prefix is encoded once
+_SSE_PROGRESS = b"event: progress\ndata: "
+_SSE_COMPLETE = b"event: complete\ndata: "
+_SSE_ERROR = b"event: error\ndata: "
+_SSE_RECIPE_META = b"event: recipe_meta\ndata: "
+_SSE_INGREDIENT = b"event: ingredient\ndata: "
+_SSE_INSTRUCTION = b"event: instruction\ndata: "
+_SSE_SUFFIX = b"\n\n"
+
+# Response headers for every SSE stream (read-only, shared across requests)
+_SSE_HEADERS = MappingProxyType(
+    {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",
+    }
+)
+
+# Progress message keywords that identify the extraction tier
+_TIER_PATTERN = re.compile(r"metadata|audio|whisper|vision|frame|webpage|website", re.IGNORECASE)
+_TIER_KEYWORDS = {
+    "metadata": "metadata",
+    "audio": "audio",
+    "whisper": "audio",
+    "vision": "vision",
+    "frame": "vision",
+    "webpage": "website",
+    "website": "website",
+}
+
 
+# Builds a pipeline for one extraction, given an optional progress callback
+PipelineFactory = Callable[..., ExtractionPipeline]
 
-async def verify_api_key(
-    header_key: str | None = Security(_api_key_header),
-    query_key: str | None = Query(None, alias="key", include_in_schema=False),
-) -> str:
-    """Verify the API key from header or query param.
 
-    Checks X-API-Key header first, falls back to ?key= query param.
-    Query param fallback is needed for SSE/EventSource which can't set headers.
+def get_pipeline_factory(request: Request) -> PipelineFactory:
+    """Build pipelines bound to the HTTP and OpenAI clients created in lifespan.
+
+    Falls back to per-pipeline clients when lifespan hasn't run.
     """
-    settings = get_settings()
-    if not settings.api_key:
-        # No key configured — allow all (dev mode)
-        return ""
-    provided_key = header_key or query_key
-    if not provided_key or not secrets.compare_digest(provided_key, settings.api_key):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid or missing API key",
-        )
-    return provided_key
+    state = request.app.state
+    return partial(
+        ExtractionPipeline,
+        async_openai_client=getattr(state, "async_openai_client", None),
+        http_client=getattr(state, "http_client", None),
+    )
 
 
 class ExtractRequest(BaseModel):
-    """Request payload for recipe extraction."""
+    """Request payload for recipe extraction.
 
-    url: HttpUrl
+    The URL is only checked for an http(s) scheme and a sane length; the
+    pipeline parses it itself, so full HttpUrl validation isn't needed.
+    """
+
+    url: Annotated[str, StringConstraints(max_length=2048, pattern=r"(?i)^https?://")]
 
 
 class ExtractResponse(BaseModel):
@@ -65,8 +105,13 @@ class ExtractResponse(BaseModel):
     method_used: str | None = None
 
 
-class SSEProgressEvent(BaseModel):
-    """Progress event for SSE stream."""
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SSEProgressEvent:
+    """Progress event for SSE stream.
+
+    The SSE envelopes are plain dataclasses: their data is produced by the
+    server, so they skip validation and are serialized natively by orjson.
+    """
 
     type: str = "progress"
     message: str
@@ -74,104 +119,160 @@ class SSEProgressEvent(BaseModel):
     tier: str | None = None
 
 
-class SSECompleteEvent(BaseModel):
-    """Completion event for SSE stream."""
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SSECompleteEvent:
+    """Completion event for SSE stream, with the recipe as pre-serialized JSON.
+
+    The recipe is None in incremental streams, where it was already sent
+    in parts.
+    """
 
     type: str = "complete"
-    recipe: Recipe
+    recipe: orjson.Fragment | None = None
 
 
-class SSEErrorEvent(BaseModel):
+@dataclass(slots=True, frozen=True, kw_only=True)
+class SSEErrorEvent:
     """Error event for SSE stream."""
 
     type: str = "error"
     message: str
 
 
-def format_sse(event_type: str, data: str) -> str:
-    """Format data as Server-Sent Event."""
-    return f"event: {event_type}\ndata: {data}\n\n"
+def _drop_oldest_update(progress_queue: asyncio.Queue[tuple[SSEProgressEvent, bool]]) -> None:
+    """Drop the oldest queued progress update that doesn't switch tier.
+
+    Tier switches are kept so the client always sees each tier start; only
+    if every queued update is one is the oldest dropped instead.
+    """
+    updates = [progress_queue.get_nowait() for _ in range(progress_queue.qsize())]
+    index = next((i for i, (_, tier_switch) in enumerate(updates) if not tier_switch), 0)
+    del updates[index]
+    for update in updates:
+        progress_queue.put_nowait(update)
 
 
-async def extraction_event_generator(url: str) -> AsyncGenerator[str, None]:
+def incremental_recipe_events(recipe: Recipe) -> Iterator[bytes]:
+    """Frame a recipe as one SSE event per part, ending with a bodyless complete.
+
+    Emits `recipe_meta` (every field except the lists), then one `ingredient`
+    event per ingredient and one `instruction` event per step, so clients can
+    render progressively and no single frame carries the whole recipe.
+    """
+    meta = orjson.Fragment(recipe.model_dump_json(exclude={"ingredients", "instructions"}))
+    yield _SSE_RECIPE_META + orjson.dumps({"type": "recipe_meta", "recipe": meta}) + _SSE_SUFFIX
+    for ingredient in recipe.ingredients:
+        data = {"type": "ingredient", "ingredient": orjson.Fragment(ingredient.model_dump_json())}
+        yield _SSE_INGREDIENT + orjson.dumps(data) + _SSE_SUFFIX
+    for instruction in recipe.instructions:
+        data = {"type": "instruction", "instruction": orjson.Fragment(instruction.model_dump_json())}
+        yield _SSE_INSTRUCTION + orjson.dumps(data) + _SSE_SUFFIX
+    yield _SSE_COMPLETE + orjson.dumps(SSECompleteEvent()) + _SSE_SUFFIX
+
+
+async def extraction_event_generator(
+    url: str,
+    create_pipeline: PipelineFactory = ExtractionPipeline,
+    incremental: bool = False,
+) -> AsyncGenerator[bytes, None]:
     """Generate SSE events for recipe extraction progress.
 
     Yields progress updates as the extraction proceeds,
-    then yields the final recipe or error.
+    then yields the final recipe or error. With `incremental`, the
+    recipe is sent in parts (see `incremental_recipe_events`).
     """
-    # Queue to collect progress updates
-    progress_queue: asyncio.Queue[tuple[str, float]] = asyncio.Queue()
+    # Queue to collect progress updates, each flagged if it switches tier
+    progress_queue: asyncio.Queue[tuple[SSEProgressEvent, bool]] = asyncio.Queue(
+        maxsize=_PROGRESS_QUEUE_SIZE
+    )
     current_tier: str | None = None
 
     async def progress_callback(message: str, percent: float) -> None:
-        """Callback to receive progress updates from extractors."""
-        await progress_queue.put((message, percent))
+        """Callback to receive progress updates from extractors.
+
+        The tier is tracked here, as updates arrive, so dropping an update
+        can't lose a tier switch. Never blocks extraction: if a slow client
+        lets the queue fill up, an older update is dropped in favour of the
+        newest one (see `_drop_oldest_update`).
+        """
+        nonlocal current_tier
+
+        # Determine current tier from message
+        previous_tier = current_tier
+        match = _TIER_PATTERN.search(message)
+        if match:
+            current_tier = _TIER_KEYWORDS[match.group(0).lower()]
+
+        event = SSEProgressEvent(message=message, percent=percent, tier=current_tier)
+        if progress_queue.full():
+            _drop_oldest_update(progress_queue)
+        progress_queue.put_nowait((event, current_tier != previous_tier))
+
+    def progress_event(update: tuple[SSEProgressEvent, bool]) -> bytes:
+        """Format a queued progress update as an SSE frame."""
+        event, _ = update
+        return _SSE_PROGRESS + orjson.dumps(event) + _SSE_SUFFIX
 
     # Start extraction in background task
-    pipeline = ExtractionPipeline(progress_callback=progress_callback)
+    pipeline = create_pipeline(progress_callback=progress_callback)
     extraction_task = asyncio.create_task(pipeline.execute(url))
 
-    # Yield progress events until extraction completes
-    while not extraction_task.done():
-        try:
-            # Wait for progress update with timeout
-            message, percent = await asyncio.wait_for(
-                progress_queue.get(),
-                timeout=0.5,
-            )
-
-            # Determine current tier from message
-            if "metadata" in message.lower():
-                current_tier = "metadata"
-            elif "audio" in message.lower() or "whisper" in message.lower():
-                current_tier = "audio"
-            elif "vision" in message.lower() or "frame" in message.lower():
-                current_tier = "vision"
-            elif "webpage" in message.lower() or "website" in message.lower():
-                current_tier = "website"
-
-            event = SSEProgressEvent(
-                message=message,
-                percent=percent,
-                tier=current_tier,
+    # Race the next progress update against extraction completion so events
+    # are flushed as soon as they arrive; idle periods send a keep-alive ping
+    get_task = asyncio.create_task(progress_queue.get())
+    try:
+        while not extraction_task.done():
+            done, _ = await asyncio.wait(
+                {get_task, extraction_task},
+                timeout=_SSE_PING_INTERVAL,
+                return_when=asyncio.FIRST_COMPLETED,
             )
-            yield format_sse("progress", event.model_dump_json())
-
-        except asyncio.TimeoutError:
-            # No progress update, continue waiting
-            continue
-
-    # Drain any remaining progress events in the queue
+            if not done:
+                yield _SSE_PING
+            elif get_task in done:
+                yield progress_event(get_task.result())
+                get_task = asyncio.create_task(progress_queue.get())
+    finally:
+        get_task.cancel()
+
+    # Drain any progress events queued before extraction finished
     while not progress_queue.empty():
-        try:
-            message, percent = progress_queue.get_nowait()
-            event = SSEProgressEvent(
-                message=message,
-                percent=percent,
-                tier=current_tier,
-            )
-            yield format_sse("progress", event.model_dump_json())
-        except asyncio.QueueEmpty:
-            break
+        yield progress_event(progress_queue.get_nowait())
 
     # Get the result
     try:
         recipe = await extraction_task
 
-        if recipe:
-            event = SSECompleteEvent(recipe=recipe)
-            yield format_sse("complete", event.model_dump_json())
+        if recipe and incremental:
+            for frame in incremental_recipe_events(recipe):
+                yield frame
+        elif recipe:
+            # Dump the recipe straight to JSON and embed it as-is in the envelope
+            event = SSECompleteEvent(recipe=orjson.Fragment(recipe.model_dump_json()))
+            yield _SSE_COMPLETE + orjson.dumps(event) + _SSE_SUFFIX
         else:
             event = SSEErrorEvent(message="Could not extract recipe from this URL")
-            yield format_sse("error", event.model_dump_json())
+            yield _SSE_ERROR + orjson.dumps(event) + _SSE_SUFFIX
 
     except Exception as e:
         logger.exception(f"Extraction failed for {url}")
         event = SSEErrorEvent(message=str(e))
-        yield format_sse("error", event.model_dump_json())
+        yield _SSE_ERROR + orjson.dumps(event) + _SSE_SUFFIX
 
-    # Small delay to ensure the final event is flushed to the client
-    await asyncio.sleep(0.1)
+
+def sse_response(events: AsyncGenerator[bytes, None]) -> StreamingResponse:
+    """Wrap an SSE event generator in a streaming response.
+
+    Only async generators are accepted: Starlette iterates sync iterables
+    in a threadpool, which would throttle every event of the stream.
+    """
+    if not inspect.isasyncgen(events):
+        raise TypeError(f"SSE responses require an async generator, got {type(events).__name__}")
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
 
 
 @router.get(
@@ -181,7 +282,10 @@ async def extraction_event_generator(url: str) -> AsyncGenerator[str, None]:
 )
 async def extract_recipe_stream(
     url: str = Query(..., description="URL to extract recipe from"),
-    _key: str = Depends(verify_api_key),
+    incremental: bool = Query(
+        False, description="Stream the recipe in parts instead of one complete event"
+    ),
+    create_pipeline: PipelineFactory = Depends(get_pipeline_factory),
 ) -> StreamingResponse:
     """Extract recipe with streaming progress updates.
 
@@ -190,6 +294,10 @@ async def extract_recipe_stream(
     - `complete` event with the extracted recipe
     - `error` event if extraction fails
 
+    With `incremental=true`, the recipe is instead sent as a `recipe_meta`
+    event, one `ingredient` event per ingredient and one `instruction`
+    event per step, followed by a `complete` event with a null recipe.
+
     Example client usage:
     ```javascript
     const eventSource = new EventSource('/api/v1/extract/stream?url=...');
@@ -209,15 +317,7 @@ async def extract_recipe_stream(
     });
     ```
     """
-    return StreamingResponse(
-        extraction_event_generator(url),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return sse_response(extraction_event_generator(url, create_pipeline, incremental))
 
 
 @router.post(
@@ -226,7 +326,10 @@ async def extract_recipe_stream(
     summary="Extract recipe from video URL",
     description="Extracts structured recipe data from a video URL using tiered fallback.",
 )
-async def extract_recipe(request: ExtractRequest, _key: str = Depends(verify_api_key)) -> ExtractResponse:
+async def extract_recipe(
+    request: ExtractRequest,
+    create_pipeline: PipelineFactory = Depends(get_pipeline_factory),
+) -> ExtractResponse:
     """Extract recipe from a video URL.
 
     Uses a tiered fallback pipeline:
@@ -239,14 +342,14 @@ async def extract_recipe(request: ExtractRequest, _key: str = Depends(verify_api
     Returns the extracted recipe directly - frontend saves to Convex.
     """
     try:
-        pipeline = ExtractionPipeline()
-        recipe = await pipeline.execute(str(request.url))
+        pipeline = create_pipeline()
+        recipe = await pipeline.execute(request.url)
 
         if recipe:
             return ExtractResponse(
                 success=True,
                 recipe=recipe,
-                method_used=recipe.method_used.value,
+                method_used=recipe.method_used,
             )
         else:
             return ExtractResponse(
@@ -325,7 +428,7 @@ class PopulateResponse(BaseModel):
     summary="Populate discover recipes",
     description="Fetches recipes from TheMealDB and enriches them with OpenAI for the discover feed.",
 )
-async def populate_discover_recipes(request: PopulateRequest, _key: str = Depends(verify_api_key)) -> PopulateResponse:
+async def populate_discover_recipes(request: PopulateRequest) -> PopulateResponse | ORJSONResponse:
     """Populate discover recipes from TheMealDB.
 
     Fetches random recipes from TheMealDB API, then processes each
@@ -335,7 +438,10 @@ async def populate_discover_recipes(request: PopulateRequest, _key: str = Depend
     discover feed runs low on recipes.
 
     Returns:
-        List of enriched recipes ready for storage in Convex.
+        List of enriched recipes ready for storage in Convex. The recipes are
+        already plain dicts in the response shape, so they are returned
+        directly rather than re-validated through PopulateResponse, which
+        only documents the schema.
     """
     try:
         populator = RecipePopulator()
@@ -345,10 +451,13 @@ async def populate_discover_recipes(request: PopulateRequest, _key: str = Depend
             exclude_ingredients=request.exclude_ingredients,
         )
 
-        return PopulateResponse(
-            success=True,
-            count=len(recipes),
-            recipes=[PopulatedRecipeResponse(**r.to_dict()) for r in recipes],
+        return ORJSONResponse(
+            {
+                "success": True,
+                "count": len(recipes),
+                "recipes": [r.to_dict() for r in recipes],
+                "error": None,
+            }
         )
 
     except ValueError as e:
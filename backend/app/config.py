@@ -1,6 +1,7 @@
 """Application configuration using Pydantic Settings."""
 
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,6 +32,32 @@ class Settings(BaseSettings):
 
     # Processing Configuration
     max_video_duration_seconds: int = 600
+    # Upper bound on yt-dlp metadata scrapes running at once
+    max_concurrent_scrapes: int = 4
+
+    # Start the audio tier alongside the metadata tier instead of after it.
+    # Cuts latency when metadata has no recipe, at the cost of Whisper calls
+    # that are discarded when it does
+    speculative_audio_tier: bool = False
+
+    # Cache Configuration
+    # yt-dlp info, transcripts, and recipes are reused per URL for this long
+    # (signed caption/media URLs in the info dict expire after a few hours)
+    cache_ttl_seconds: int = 900
+    cache_max_entries: int = 128
+    # LLM responses are keyed by prompt content, so they stay valid longer
+    llm_cache_ttl_seconds: int = 86400
+    # Pages the populator failed to extract (no recipe, too little content, or
+    # a 4xx from the site) are skipped for this long
+    failed_extraction_ttl_seconds: int = 21600
+
+    # Transcription Configuration
+    # "openai" uses the Whisper API; "local" runs faster-whisper in-process
+    # (requires the optional faster-whisper package)
+    transcription_backend: Literal["openai", "local"] = "openai"
+    local_whisper_model: str = "small"
+    local_whisper_device: str = "auto"
+    local_whisper_compute_type: str = "int8"
 
     @property
     def is_development(self) -> bool:
@@ -17,9 +17,12 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.api import router
+from app.api import APIKeyMiddleware, router
 from app.config import get_settings
+from app.services.http_client import get_http_client
+from app.services.openai_clients import get_async_openai_client
 
 # Configure logging
 logging.basicConfig(
@@ -33,11 +36,22 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifecycle manager.
 
-    Handles startup and shutdown events.
+    Handles startup and shutdown events. Exposes the process-wide HTTP and
+    OpenAI clients to every extraction so connection pools are reused
+    across requests, and closes them on shutdown.
     """
     settings = get_settings()
     logger.info(f"Starting Recipe Extractor (debug={settings.debug})")
-    yield
+    async with (
+        get_http_client() as http_client,
+        get_async_openai_client() as async_openai_client,
+    ):
+        app.state.http_client = http_client
+        app.state.async_openai_client = async_openai_client
+        yield
+    # Closed clients can't be reused; a restarted app gets fresh ones
+    get_http_client.cache_clear()
+    get_async_openai_client.cache_clear()
     logger.info("Shutting down Recipe Extractor")
 
 
@@ -58,9 +72,21 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
+        default_response_class=ORJSONResponse,
         lifespan=lifespan,
     )
 
+    # API key auth, checked before routing. Registered before CORS so CORS
+    # stays outermost: preflights are answered and 403s get CORS headers.
+    # No key configured — allow all (dev mode).
+    if settings.api_key:
+        app.add_middleware(
+            APIKeyMiddleware,
+            api_key=settings.api_key,
+            protected_prefix="/api/",
+            public_paths={"/api/v1/health"},
+        )
+
     # CORS configuration
     # Mobile apps don't send Origin headers, so CORS is mainly for web clients.
     # API key auth is the primary security layer.
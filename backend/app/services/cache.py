@@ -0,0 +1,141 @@
+"""In-process caches shared across extraction tiers.
+
+Tier fallbacks and repeat submissions for the same URL reuse the yt-dlp
+info dict, the audio transcript, and the extracted recipe instead of
+scraping, transcribing, and parsing again. LLM responses are cached by
+prompt content, so identical inputs skip the model call. URLs that failed
+to extract are remembered so repeat populate runs don't retry them.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Generic, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+from app.config import get_settings
+from app.schemas import Recipe
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache whose entries expire after a fixed time-to-live.
+
+    Not thread-safe; it is only touched from the event loop.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid after it is stored
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: str) -> V | None:
+        """Return the cached value for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        if self._maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def cache_key(url: str) -> str:
+    """Canonicalize a URL for use as a cache key.
+
+    Lowercases the scheme and host and drops the fragment, which never
+    changes what yt-dlp or the website fetch returns.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
+def video_cache_key(info: dict, url: str) -> str:
+    """Build a cache key from a yt-dlp info dict.
+
+    Keys on the extractor and video ID so different URLs for the same
+    video (short links, mobile hosts, tracking params) share an entry.
+    """
+    video_id = info.get("id")
+    if not video_id:
+        return cache_key(url)
+    return f"{info.get('extractor_key', '')}:{video_id}"
+
+
+def content_cache_key(*parts: str | bytes) -> str:
+    """Hash a sequence of strings or raw bytes into a content-addressed cache key.
+
+    Each part is length-prefixed before hashing so different splits of the
+    same text (e.g. a title ending where a description begins) can't collide.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part if isinstance(part, bytes) else part.encode()
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+@lru_cache
+def get_video_info_cache() -> TTLCache[dict]:
+    """Get the shared cache of yt-dlp info dicts keyed by URL."""
+    settings = get_settings()
+    return TTLCache(settings.cache_max_entries, settings.cache_ttl_seconds)
+
+
+@lru_cache
+def get_transcript_cache() -> TTLCache[str]:
+    """Get the shared cache of audio transcripts keyed by video."""
+    settings = get_settings()
+    return TTLCache(settings.cache_max_entries, settings.cache_ttl_seconds)
+
+
+@lru_cache
+def get_recipe_cache() -> TTLCache[Recipe]:
+    """Get the shared cache of extracted recipes keyed by URL."""
+    settings = get_settings()
+    return TTLCache(settings.cache_max_entries, settings.cache_ttl_seconds)
+
+
+@lru_cache
+def get_failed_extraction_cache() -> TTLCache[str]:
+    """Get the shared cache of extraction errors keyed by URL."""
+    settings = get_settings()
+    return TTLCache(settings.cache_max_entries, settings.failed_extraction_ttl_seconds)
+
+
+@lru_cache
+def get_llm_response_cache() -> TTLCache[dict]:
+    """Get the shared cache of decoded LLM responses keyed by prompt content."""
+    settings = get_settings()
+    return TTLCache(settings.cache_max_entries, settings.llm_cache_ttl_seconds)
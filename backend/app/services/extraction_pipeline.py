@@ -8,10 +8,17 @@ Coordinates the extraction system:
   3. Vision Tier - Analyzes frames with GPT-4o (deep fallback)
 """
 
+import asyncio
 import logging
+import re
 from urllib.parse import urlparse
 
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import get_settings
 from app.schemas import Recipe
+from app.services.cache import cache_key, get_recipe_cache
 from app.services.extractors import (
     AudioExtractor,
     MetadataExtractor,
@@ -19,51 +26,41 @@ from app.services.extractors import (
     VisionExtractor,
     WebsiteExtractor,
 )
-from app.services.extractors.base import BaseExtractor
+from app.services.extractors.base import BaseExtractor, ExtractionResult
 
 logger = logging.getLogger(__name__)
 
-# Domains known to host video content
-VIDEO_DOMAINS = {
-    # YouTube
-    "youtube.com",
-    "www.youtube.com",
-    "youtu.be",
-    "m.youtube.com",
-    # TikTok
-    "tiktok.com",
-    "www.tiktok.com",
-    "vm.tiktok.com",
-    # Instagram
-    "instagram.com",
-    "www.instagram.com",
-    # Facebook
-    "facebook.com",
-    "www.facebook.com",
-    "fb.watch",
-    # Twitter/X
-    "twitter.com",
-    "x.com",
-    # Vimeo
-    "vimeo.com",
-    "www.vimeo.com",
-    # Twitch (clips)
-    "twitch.tv",
-    "www.twitch.tv",
-    "clips.twitch.tv",
-}
-
-# Path patterns that indicate video content
-VIDEO_PATH_PATTERNS = [
-    "/reel/",
-    "/reels/",
-    "/shorts/",
-    "/video/",
-    "/watch",
-    "/v/",
-    "/p/",  # Instagram posts (can be video)
-    "/status/",  # Twitter posts (can be video)
-]
+# Domains known to host video content; subdomains (www., m., vm., clips.)
+# match too
+VIDEO_DOMAINS: frozenset[str] = frozenset(
+    {
+        "youtube.com",
+        "youtu.be",
+        "tiktok.com",
+        "instagram.com",
+        "facebook.com",
+        "fb.watch",
+        "twitter.com",
+        "x.com",
+        "vimeo.com",
+        # Twitch (clips)
+        "twitch.tv",
+    }
+)
+
+# Path patterns that indicate video content, matched anywhere in the path:
+# /reel/, /reels/, /shorts/, /video/, /watch (prefix), /v/,
+# /p/ (Instagram posts, can be video), /status/ (Twitter posts, can be video)
+_VIDEO_PATH_RE = re.compile(r"/(?:(?:reels?|shorts|video|v|p|status)/|watch)")
+
+
+def _is_video_host(host: str) -> bool:
+    """Check a hostname and each parent domain against VIDEO_DOMAINS."""
+    while host:
+        if host in VIDEO_DOMAINS:
+            return True
+        _, _, host = host.partition(".")
+    return False
 
 
 def is_video_url(url: str) -> bool:
@@ -77,31 +74,34 @@ def is_video_url(url: str) -> bool:
     """
     try:
         parsed = urlparse(url)
-        domain = parsed.netloc.lower()
 
-        # Remove www. prefix for comparison
-        if domain.startswith("www."):
-            domain_clean = domain[4:]
-        else:
-            domain_clean = domain
-
-        # Check if domain is a known video platform
-        if domain in VIDEO_DOMAINS or domain_clean in VIDEO_DOMAINS:
+        # hostname is lowercased and excludes any port or credentials
+        if _is_video_host(parsed.hostname or ""):
             return True
 
         # Check for video path patterns
-        path_lower = parsed.path.lower()
-        for pattern in VIDEO_PATH_PATTERNS:
-            if pattern in path_lower:
-                return True
-
-        return False
+        return _VIDEO_PATH_RE.search(parsed.path.lower()) is not None
 
     except Exception:
         # If we can't parse the URL, assume it's not a video
         return False
 
 
+def _log_success(tier: str, recipe: Recipe) -> None:
+    """Log a summary of a successfully extracted recipe."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    logger.info("=== EXTRACTION SUCCESSFUL ===")
+    logger.info(f"Tier: {tier}")
+    logger.info(f"Title: {recipe.title}")
+    logger.info(f"Cuisine: {recipe.cuisine}")
+    logger.info(f"Difficulty: {recipe.difficulty}")
+    logger.info(f"Ingredients: {len(recipe.ingredients)}")
+    logger.info(f"Instructions: {len(recipe.instructions)}")
+    logger.info(f"Servings: {recipe.servings}")
+    logger.info(f"Total time: {recipe.total_time_minutes} min")
+
+
 class ExtractionPipeline:
     """Orchestrates the extraction pipeline.
 
@@ -110,26 +110,39 @@ class ExtractionPipeline:
     - Website URLs go directly to website extractor
     """
 
-    def __init__(self, progress_callback: ProgressCallback | None = None) -> None:
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        async_openai_client: AsyncOpenAI | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         """Initialize the pipeline with optional progress callback.
 
         Args:
             progress_callback: Async function to report progress updates
+            async_openai_client: Shared async OpenAI client passed to every extractor
+            http_client: Shared HTTP client passed to extractors that fetch pages
         """
         self._progress_callback = progress_callback
+        self._async_openai_client = async_openai_client
+        self._http_client = http_client
+        self._speculative_audio = get_settings().speculative_audio_tier
 
     def _create_video_tiers(self) -> list[BaseExtractor]:
         """Create the video extraction tier chain."""
         return [
-            MetadataExtractor(self._progress_callback),
-            AudioExtractor(self._progress_callback),
-            VisionExtractor(self._progress_callback),
+            MetadataExtractor(
+                self._progress_callback, self._async_openai_client, self._http_client
+            ),
+            AudioExtractor(self._progress_callback, self._async_openai_client),
+            VisionExtractor(self._progress_callback, self._async_openai_client),
         ]
 
     async def execute(self, url: str) -> Recipe | None:
         """Execute the extraction pipeline for a given URL.
 
-        Routes to website or video extraction based on URL.
+        Routes to website or video extraction based on URL. Successful
+        results are cached per URL, so repeat submissions return immediately.
 
         Args:
             url: URL to extract recipe from
@@ -137,12 +150,23 @@ class ExtractionPipeline:
         Returns:
             Extracted Recipe or None if extraction fails
         """
+        recipe_cache = get_recipe_cache()
+        key = cache_key(url)
+        cached = recipe_cache.get(key)
+        if cached is not None:
+            logger.info(f"Using cached recipe for {url}")
+            return cached.model_copy(deep=True)
+
         if is_video_url(url):
             logger.info(f"Detected video URL: {url}")
-            return await self._extract_from_video(url)
+            recipe = await self._extract_from_video(url)
         else:
             logger.info(f"Detected website URL: {url}")
-            return await self._extract_from_website(url)
+            recipe = await self._extract_from_website(url)
+
+        if recipe:
+            recipe_cache.set(key, recipe.model_copy(deep=True))
+        return recipe
 
     async def _extract_from_website(self, url: str) -> Recipe | None:
         """Extract recipe from a website URL.
@@ -153,21 +177,15 @@ class ExtractionPipeline:
         Returns:
             Extracted Recipe or None if extraction fails
         """
-        extractor = WebsiteExtractor(self._progress_callback)
+        extractor = WebsiteExtractor(
+            self._progress_callback, self._async_openai_client, self._http_client
+        )
         logger.info(f"Trying {extractor.tier_name} extractor for {url}")
 
         result = await extractor.extract(url)
 
         if result.success and result.recipe:
-            logger.info("=== EXTRACTION SUCCESSFUL ===")
-            logger.info(f"Tier: {extractor.tier_name}")
-            logger.info(f"Title: {result.recipe.title}")
-            logger.info(f"Cuisine: {result.recipe.cuisine}")
-            logger.info(f"Difficulty: {result.recipe.difficulty}")
-            logger.info(f"Ingredients: {len(result.recipe.ingredients)}")
-            logger.info(f"Instructions: {len(result.recipe.instructions)}")
-            logger.info(f"Servings: {result.recipe.servings}")
-            logger.info(f"Total time: {result.recipe.total_time_minutes} min")
+            _log_success(extractor.tier_name, result.recipe)
             return result.recipe
 
         logger.warning(f"Website extraction failed for {url}: {result.error}")
@@ -177,7 +195,9 @@ class ExtractionPipeline:
         """Extract recipe from a video URL using tiered fallback.
 
         Attempts each tier in order, falling back to the next
-        if the current tier fails or signals fallback.
+        if the current tier fails or signals fallback. With
+        `speculative_audio_tier` enabled the audio tier starts immediately
+        and runs alongside the metadata tier.
 
         Args:
             url: Video URL to extract from
@@ -186,23 +206,50 @@ class ExtractionPipeline:
             Extracted Recipe or None if all tiers fail
         """
         tiers = self._create_video_tiers()
+
+        # Speculatively start the audio tier so it overlaps the metadata tier;
+        # it is cancelled if an earlier tier succeeds
+        speculative: dict[BaseExtractor, asyncio.Task[ExtractionResult]] = {}
+        if self._speculative_audio:
+            speculative = {
+                extractor: asyncio.create_task(extractor.extract(url))
+                for extractor in tiers
+                if isinstance(extractor, AudioExtractor)
+            }
+
+        try:
+            return await self._run_video_tiers(url, tiers, speculative)
+        finally:
+            for task in speculative.values():
+                task.cancel()
+
+    async def _run_video_tiers(
+        self,
+        url: str,
+        tiers: list[BaseExtractor],
+        speculative: dict[BaseExtractor, asyncio.Task[ExtractionResult]],
+    ) -> Recipe | None:
+        """Run video tiers in order until one succeeds.
+
+        Args:
+            url: Video URL to extract from
+            tiers: Extractors in fallback order
+            speculative: Already-started extraction tasks, used in place of
+                calling `extract` for their tier
+
+        Returns:
+            Extracted Recipe or None if all tiers fail
+        """
         last_error: str | None = None
 
         for extractor in tiers:
             logger.info(f"Trying {extractor.tier_name} tier for {url}")
 
-            result = await extractor.extract(url)
+            task = speculative.get(extractor)
+            result = await task if task else await extractor.extract(url)
 
             if result.success and result.recipe:
-                logger.info("=== EXTRACTION SUCCESSFUL ===")
-                logger.info(f"Tier: {extractor.tier_name}")
-                logger.info(f"Title: {result.recipe.title}")
-                logger.info(f"Cuisine: {result.recipe.cuisine}")
-                logger.info(f"Difficulty: {result.recipe.difficulty}")
-                logger.info(f"Ingredients: {len(result.recipe.ingredients)}")
-                logger.info(f"Instructions: {len(result.recipe.instructions)}")
-                logger.info(f"Servings: {result.recipe.servings}")
-                logger.info(f"Total time: {result.recipe.total_time_minutes} min")
+                _log_success(extractor.tier_name, result.recipe)
                 return result.recipe
 
             last_error = result.error
@@ -4,21 +4,74 @@ Downloads audio from video, transcribes with OpenAI Whisper API,
 then parses the transcript with GPT-4o-mini.
 """
 
-import json
+import asyncio
 import logging
+import os
 import re
 import tempfile
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import yt_dlp
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI
 
 from app.config import get_settings
-from app.schemas import ExtractionMethod, Ingredient, Instruction, Recipe
-from app.services.extractors.base import BaseExtractor, ExtractionResult, ProgressCallback
+from app.schemas import ExtractionMethod, Recipe
+from app.services.cache import get_transcript_cache, video_cache_key
+from app.services.extractors.base import (
+    BaseExtractor,
+    ExtractionResult,
+    ProgressCallback,
+    get_scratch_dir,
+)
+from app.services.extractors.recipe_builder import recipe_from_response
+from app.services.extractors.recipe_schema import RECIPE_RESPONSE_FORMAT
+from app.services.openai_clients import get_async_openai_client
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
 
 logger = logging.getLogger(__name__)
 
+# Audio is split into chunks of at most this length and transcribed
+# concurrently. Each chunk is cut in the last pause found within
+# CUT_SEARCH_SECONDS before its length is reached, so no word is split
+# between two Whisper calls; with no pause there, it is cut at the limit
+TRANSCRIPTION_CHUNK_SECONDS = 45
+CUT_SEARCH_SECONDS = 15
+MAX_CONCURRENT_TRANSCRIPTIONS = 4
+
+# Pauses between words and sentences; longer silence is already removed by
+# SILENCE_FILTER, so these are short
+PAUSE_FILTER = "silencedetect=noise=-40dB:d=0.25"
+_RE_PAUSE_START = re.compile(r"silence_start: (-?[\d.]+)")
+_RE_PAUSE_END = re.compile(r"silence_end: ([\d.]+)")
+_RE_DURATION = re.compile(r"Duration: (\d+):(\d+):([\d.]+)")
+
+# Downloaded audio is transcoded to 16kHz mono MP3 at this bitrate
+TRANSCODE_SAMPLE_RATE = "16000"
+TRANSCODE_BITRATE_KBPS = "32"
+
+# Silence longer than a second (prep pauses, music-free gaps) is cut during
+# the same transcode, so Whisper is billed and waits only for audible audio.
+# The transcode is its own ffmpeg step: yt-dlp's audio extraction would
+# stream-copy (or skip) sources already in MP3, and filters can't apply to a copy
+SILENCE_FILTER = (
+    "silenceremove=start_periods=1:start_silence=0.5:start_threshold=-40dB"
+    ":stop_periods=-1:stop_duration=1:stop_threshold=-40dB"
+)
+
+# Upper bound on the transcript parse response; a detailed recipe is
+# well under this, so it only cuts off runaway generations
+MAX_COMPLETION_TOKENS = 4000
+
+# Streamed completions are scanned this far for an early has_recipe=false
+NO_RECIPE_SCAN_CHARS = 200
+NO_RECIPE_RESPONSE = '{"has_recipe": false}'
+_RE_NO_RECIPE = re.compile(r'"has_recipe"\s*:\s*false')
+
+
 TRANSCRIPT_EXTRACTION_PROMPT = """You are a professional chef and recipe extraction expert. Analyze the following video transcript to extract a comprehensive, detailed recipe.
 
 This is a TRANSCRIPTION of spoken audio from a cooking video. The creator is explaining their recipe as they cook.
@@ -112,22 +165,75 @@ EXAMPLE OF A GOOD INSTRUCTION:
 """
 
 
-def _normalize_name(name: str) -> str:
-    """Convert ingredient name to normalized format."""
-    normalized = name.lower().strip()
-    normalized = re.sub(r"[^a-z0-9\s-]", "", normalized)
-    normalized = re.sub(r"\s+", "-", normalized)
-    return normalized
+def _chunk_cut_points(pauses: list[tuple[float, float]], duration: float) -> list[float]:
+    """Pick the times at which to split audio into transcription chunks.
+
+    Each chunk ends at the midpoint of the last pause within
+    CUT_SEARCH_SECONDS before TRANSCRIPTION_CHUNK_SECONDS, or at
+    TRANSCRIPTION_CHUNK_SECONDS if there is none.
+
+    Args:
+        pauses: (start, end) of each pause, in playback order
+        duration: Length of the audio in seconds
+
+    Returns:
+        Cut times in seconds, empty if the audio fits in one chunk
+    """
+    midpoints = [(start + end) / 2 for start, end in pauses]
+    cuts: list[float] = []
+    chunk_start = 0.0
+    while duration - chunk_start > TRANSCRIPTION_CHUNK_SECONDS:
+        limit = chunk_start + TRANSCRIPTION_CHUNK_SECONDS
+        cut = max(
+            (t for t in midpoints if limit - CUT_SEARCH_SECONDS <= t <= limit),
+            default=limit,
+        )
+        cuts.append(cut)
+        chunk_start = cut
+    return cuts
+
+
+@lru_cache
+def _get_local_whisper_model(model_size: str, device: str, compute_type: str) -> "WhisperModel":
+    """Load the local faster-whisper model once per process."""
+    from faster_whisper import WhisperModel
+
+    logger.info(f"Loading local Whisper model: {model_size} ({device}, {compute_type})")
+    return WhisperModel(model_size, device=device, compute_type=compute_type)
+
+
+def _transcribe_locally(audio_path: str, model_size: str, device: str, compute_type: str) -> str:
+    """Transcribe audio with local faster-whisper (blocking).
+
+    VAD filtering skips silent and music-only stretches, so only speech
+    regions are decoded.
+    """
+    model = _get_local_whisper_model(model_size, device, compute_type)
+    segments, _ = model.transcribe(
+        audio_path,
+        beam_size=1,
+        vad_filter=True,
+        vad_parameters={"min_silence_duration_ms": 500},
+    )
+    return " ".join(segment.text.strip() for segment in segments)
 
 
 class AudioExtractor(BaseExtractor):
     """Extracts recipe using OpenAI Whisper + GPT-4o-mini."""
 
-    def __init__(self, progress_callback: ProgressCallback | None = None) -> None:
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        openai_client: AsyncOpenAI | None = None,
+    ) -> None:
         super().__init__(progress_callback)
         settings = get_settings()
         self._max_duration = settings.max_video_duration_seconds
-        self._openai = OpenAI(api_key=settings.openai_api_key)
+        self._openai = openai_client or get_async_openai_client()
+        self._transcription_backend = settings.transcription_backend
+        self._local_whisper_model = settings.local_whisper_model
+        self._local_whisper_device = settings.local_whisper_device
+        self._local_whisper_compute_type = settings.local_whisper_compute_type
 
     @property
     def tier_name(self) -> str:
@@ -138,43 +244,52 @@ class AudioExtractor(BaseExtractor):
         try:
             await self._report_progress("Downloading audio...", 0.1)
 
-            audio_path = await self._download_audio(url)
-            if not audio_path:
+            info = await self._extract_video_info(url, {"quiet": True, "no_warnings": True})
+            if not info:
                 return ExtractionResult(
                     success=False,
                     should_fallback=True,
                     error="Failed to download audio",
                 )
 
-            try:
-                await self._report_progress("Transcribing audio with Whisper...", 0.3)
-
-                transcript = await self._transcribe(audio_path)
-                if not transcript or len(transcript.strip()) < 50:
-                    logger.info(f"Insufficient speech in audio for {url}")
+            # Transcripts are cached per video so retries skip download and Whisper
+            transcript_cache = get_transcript_cache()
+            transcript_key = video_cache_key(info, url)
+            transcript = transcript_cache.get(transcript_key)
+            if transcript is None:
+                transcript = await self._download_and_transcribe(info)
+                if transcript is None:
                     return ExtractionResult(
                         success=False,
                         should_fallback=True,
-                        error="No significant speech detected",
+                        error="Failed to download audio",
                     )
+                transcript_cache.set(transcript_key, transcript)
+            else:
+                logger.info(f"Using cached transcript for {url}")
 
-                await self._report_progress("Analyzing transcript with AI...", 0.7)
+            if not transcript or len(transcript.strip()) < 50:
+                logger.info(f"Insufficient speech in audio for {url}")
+                return ExtractionResult(
+                    success=False,
+                    should_fallback=True,
+                    error="No significant speech detected",
+                )
 
-                recipe = await self._parse_transcript(transcript)
-                if not recipe:
-                    return ExtractionResult(
-                        success=False,
-                        should_fallback=True,
-                        error="No recipe found in transcript",
-                    )
+            await self._report_progress("Analyzing transcript with AI...", 0.7)
 
-                await self._report_progress("Recipe extracted successfully", 1.0)
+            recipe = await self._parse_transcript(transcript)
+            if not recipe:
+                return ExtractionResult(
+                    success=False,
+                    should_fallback=True,
+                    error="No recipe found in transcript",
+                )
 
-                recipe.source_url = url
-                return ExtractionResult(success=True, recipe=recipe)
+            await self._report_progress("Recipe extracted successfully", 1.0)
 
-            finally:
-                Path(audio_path).unlink(missing_ok=True)
+            recipe.source_url = url
+            return ExtractionResult(success=True, recipe=recipe)
 
         except Exception as e:
             logger.exception(f"Audio extraction failed for {url}")
@@ -184,56 +299,124 @@ class AudioExtractor(BaseExtractor):
                 error=str(e),
             )
 
-    async def _download_audio(self, url: str) -> str | None:
-        """Download audio from video using yt-dlp."""
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            output_path = tmp.name
+    async def _download_and_transcribe(self, info: dict) -> str | None:
+        """Download the audio track to a temporary directory and transcribe it.
+
+        Returns:
+            Transcript text, or None if the audio could not be downloaded
+        """
+        with tempfile.TemporaryDirectory(prefix="ytdlp_", dir=get_scratch_dir()) as tmpdir:
+            audio_path = await self._download_audio(info, tmpdir)
+            if not audio_path:
+                return None
+
+            await self._report_progress("Transcribing audio with Whisper...", 0.3)
+            return await self._transcribe(audio_path)
+
+    async def _download_audio(self, info: dict, output_dir: str) -> str | None:
+        """Download audio for a yt-dlp info dict into a directory.
+
+        The duration limit is checked against the info dict first, so
+        over-long videos are rejected without downloading anything.
+
+        Args:
+            info: yt-dlp info dict for the video
+            output_dir: Directory to write the audio file into
+
+        Returns:
+            Path to the audio file, or None if the download failed
+        """
+        duration = info.get("duration") or 0
+        if duration > self._max_duration:
+            logger.warning(f"Video too long: {duration}s > {self._max_duration}s")
+            return None
 
         ydl_opts = {
             "format": "bestaudio/best",
-            "outtmpl": output_path.replace(".mp3", ""),
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "mp3",
-                    "preferredquality": "128",
-                }
-            ],
+            "outtmpl": str(Path(output_dir) / "audio.%(ext)s"),
             "quiet": True,
             "no_warnings": True,
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-
-                duration = info.get("duration", 0)
-                if duration > self._max_duration:
-                    logger.warning(f"Video too long: {duration}s > {self._max_duration}s")
-                    return None
-
-            if Path(output_path).exists():
-                return output_path
-            if Path(f"{output_path}.mp3").exists():
-                return f"{output_path}.mp3"
-
-            return None
+            await self._download_from_info(info, ydl_opts)
 
+            # The directory is private to this download, so the only file
+            # in it is the audio
+            with os.scandir(output_dir) as entries:
+                download_path = next((entry.path for entry in entries if entry.is_file()), None)
         except Exception as e:
             logger.warning(f"Audio download failed: {e}")
             return None
 
+        if download_path is None:
+            return None
+        return await self._transcode_audio(download_path, output_dir)
+
+    async def _transcode_audio(self, audio_path: str, output_dir: str) -> str:
+        """Transcode audio to 16kHz mono MP3 with silence removed.
+
+        Whisper resamples to 16kHz mono internally, so anything richer only
+        adds upload bytes and encoder time. Always re-encodes, whatever the
+        source codec, so the filters apply. Falls back to the downloaded
+        file if transcoding fails.
+        """
+        output_path = str(Path(output_dir) / "transcoded.mp3")
+        cmd = [
+            "ffmpeg",
+            "-i", audio_path,
+            "-vn",
+            "-af", SILENCE_FILTER,
+            "-ar", TRANSCODE_SAMPLE_RATE,
+            "-ac", "1",
+            "-c:a", "libmp3lame",
+            "-b:a", f"{TRANSCODE_BITRATE_KBPS}k",
+            output_path,
+            "-y",
+            "-loglevel", "error",
+        ]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+        except OSError as e:
+            logger.warning(f"ffmpeg audio transcode failed: {e}")
+            return audio_path
+
+        if process.returncode != 0:
+            logger.warning(f"ffmpeg audio transcode failed: {stderr.decode(errors='replace').strip()}")
+            return audio_path
+
+        return output_path
+
     async def _transcribe(self, audio_path: str) -> str:
-        """Transcribe audio using OpenAI Whisper API."""
+        """Transcribe audio with the configured backend.
+
+        Uses local faster-whisper when `transcription_backend` is "local",
+        falling back to the OpenAI Whisper API if the local model fails.
+        """
         logger.info("=== TRANSCRIBING AUDIO ===")
         logger.info(f"Audio file: {audio_path}")
 
-        with open(audio_path, "rb") as audio_file:
-            transcript = self._openai.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="text",
-            )
+        transcript = None
+        if self._transcription_backend == "local":
+            try:
+                transcript = await asyncio.to_thread(
+                    _transcribe_locally,
+                    audio_path,
+                    self._local_whisper_model,
+                    self._local_whisper_device,
+                    self._local_whisper_compute_type,
+                )
+            except Exception as e:
+                logger.warning(f"Local transcription failed, falling back to Whisper API: {e}")
+
+        if transcript is None:
+            transcript = await self._transcribe_with_api(audio_path)
 
         logger.info("=== TRANSCRIPT ===")
         logger.info(f"Length: {len(transcript)} characters")
@@ -241,96 +424,170 @@ class AudioExtractor(BaseExtractor):
 
         return transcript
 
-    async def _parse_transcript(self, transcript: str) -> Recipe | None:
-        """Use GPT-4o-mini to parse transcript into structured recipe."""
-        prompt = TRANSCRIPT_EXTRACTION_PROMPT.format(transcript=transcript)
+    async def _transcribe_with_api(self, audio_path: str) -> str:
+        """Transcribe audio using OpenAI Whisper API.
 
-        response = self._openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
+        Long audio is split into chunks at pauses (see `_chunk_cut_points`)
+        that are transcribed concurrently, so wall time no longer grows with
+        the full duration.
+        """
+        with tempfile.TemporaryDirectory(dir=get_scratch_dir()) as tmpdir:
+            chunk_paths = await self._split_audio(audio_path, tmpdir)
+            logger.info(f"Transcribing {len(chunk_paths)} audio chunk(s)")
 
-        content = response.choices[0].message.content
-        if not content:
-            return None
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+
+            async def transcribe_chunk(chunk_path: str) -> str:
+                async with semaphore:
+                    return await self._transcribe_file(chunk_path)
+
+            chunk_texts = await asyncio.gather(*(transcribe_chunk(p) for p in chunk_paths))
 
-        data = json.loads(content)
+        return " ".join(text.strip() for text in chunk_texts if text.strip())
 
-        logger.info("=== AUDIO LLM RESPONSE ===")
-        logger.info(f"has_recipe: {data.get('has_recipe')}")
-        logger.info(f"title: {data.get('title')}")
-        logger.info(f"ingredients count: {len(data.get('ingredients', []))}")
-        logger.info(f"instructions count: {len(data.get('instructions', []))}")
+    async def _find_pauses(self, audio_path: str) -> tuple[list[tuple[float, float]], float] | None:
+        """Find the pauses in audio with ffmpeg's silencedetect filter.
 
-        if not data.get("has_recipe"):
-            logger.info("LLM determined no recipe in transcript")
+        Returns:
+            (start, end) of each pause and the audio's duration in seconds,
+            or None if detection failed
+        """
+        cmd = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i", audio_path,
+            "-af", PAUSE_FILTER,
+            "-f", "null",
+            "-",
+        ]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+        except OSError as e:
+            logger.warning(f"ffmpeg pause detection failed: {e}")
             return None
 
-        # Validate we have actual recipe content
-        if not data.get("ingredients") or not data.get("instructions"):
-            logger.info("LLM returned has_recipe=true but missing ingredients or instructions")
+        output = stderr.decode(errors="replace")
+        duration = _RE_DURATION.search(output)
+        if process.returncode != 0 or duration is None:
+            logger.warning(f"ffmpeg pause detection failed: {output.strip()[-500:]}")
             return None
 
-        logger.info("=== EXTRACTED INGREDIENTS (from audio) ===")
-        for i, ing in enumerate(data.get("ingredients", [])[:5]):
-            logger.info(f"  {i+1}. {ing.get('raw_text', ing.get('name', 'unknown'))}")
-        if len(data.get("ingredients", [])) > 5:
-            logger.info(f"  ... and {len(data['ingredients']) - 5} more")
-
-        logger.info("=== EXTRACTED INSTRUCTIONS (from audio) ===")
-        for i, inst in enumerate(data.get("instructions", [])[:3]):
-            logger.info(f"  Step {inst.get('step_number', i+1)}: {inst.get('text', '')[:100]}...")
-        if len(data.get("instructions", [])) > 3:
-            logger.info(f"  ... and {len(data['instructions']) - 3} more steps")
-
-        ingredients = []
-        for idx, i in enumerate(data.get("ingredients", [])):
-            quantity = i.get("quantity")
-            ingredients.append(
-                Ingredient(
-                    raw_text=i.get("raw_text") or f"{quantity or ''} {i.get('unit', '')} {i.get('name', '')}".strip(),
-                    name=i.get("name") or "",
-                    normalized_name=i.get("normalized_name") or _normalize_name(i.get("name") or ""),
-                    quantity=float(quantity) if quantity is not None else 0.0,
-                    unit=i.get("unit") or "",
-                    preparation=i.get("preparation") or "",
-                    category=i.get("category") or "",
-                    optional=bool(i.get("optional")),
-                    sort_order=i.get("sort_order") or idx + 1,
-                )
-            )
+        hours, minutes, seconds = duration.groups()
+        # A pause still open at the end of the audio has no end line and is dropped
+        starts = [float(m) for m in _RE_PAUSE_START.findall(output)]
+        ends = [float(m) for m in _RE_PAUSE_END.findall(output)]
+        pauses = list(zip(starts, ends, strict=False))
+        return pauses, int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+    async def _split_audio(self, audio_path: str, output_dir: str) -> list[str]:
+        """Split audio into ordered chunks with ffmpeg's segment muxer.
+
+        Cuts are placed in pauses (see `_chunk_cut_points`), or every
+        TRANSCRIPTION_CHUNK_SECONDS if pause detection fails. Streams are
+        copied, not re-encoded, so splitting is cheap. Falls back to the
+        whole file if splitting fails.
+        """
+        found = await self._find_pauses(audio_path)
+        if found is None:
+            split_args = ["-segment_time", str(TRANSCRIPTION_CHUNK_SECONDS)]
+        else:
+            cuts = _chunk_cut_points(*found)
+            if not cuts:
+                return [audio_path]
+            logger.info(f"Splitting audio at {', '.join(f'{t:.1f}s' for t in cuts)}")
+            split_args = ["-segment_times", ",".join(f"{t:.3f}" for t in cuts)]
+
+        suffix = Path(audio_path).suffix
+        cmd = [
+            "ffmpeg",
+            "-i", audio_path,
+            "-f", "segment",
+            *split_args,
+            "-reset_timestamps", "1",
+            "-c", "copy",
+            f"{output_dir}/chunk_%03d{suffix}",
+            "-y",
+            "-loglevel", "error",
+        ]
 
-        instructions = []
-        for idx, inst in enumerate(data.get("instructions", [])):
-            instructions.append(
-                Instruction(
-                    step_number=inst.get("step_number", idx + 1),
-                    text=inst.get("text", ""),
-                    time_seconds=inst.get("time_seconds"),
-                    temperature=inst.get("temperature"),
-                    tip=inst.get("tip"),
-                )
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
             )
+            _, stderr = await process.communicate()
+        except OSError as e:
+            logger.warning(f"ffmpeg audio split failed: {e}")
+            return [audio_path]
+
+        # The %03d segment names sort lexically in playback order
+        with os.scandir(output_dir) as entries:
+            chunk_paths = sorted(entry.path for entry in entries if entry.name.startswith("chunk_"))
+        if process.returncode != 0 or not chunk_paths:
+            logger.warning(f"ffmpeg audio split failed: {stderr.decode(errors='replace').strip()}")
+            return [audio_path]
+
+        return chunk_paths
+
+    async def _transcribe_file(self, audio_path: str) -> str:
+        """Transcribe a single audio file with Whisper.
+
+        The file is passed as a Path so the async client reads it off the
+        event loop.
+        """
+        return await self._openai.audio.transcriptions.create(
+            model="whisper-1",
+            file=Path(audio_path),
+            response_format="text",
+        )
+
+    async def _complete_json(self, prompt: str) -> str | None:
+        """Stream a structured recipe completion, stopping early if there is no recipe.
+
+        The response schema puts `has_recipe` first, so a negative answer is visible
+        in the first few chunks and the rest of the response is skipped.
 
-        return Recipe(
-            title=data["title"],
-            description=data.get("description", ""),
-            cuisine=data.get("cuisine", ""),
-            difficulty=data.get("difficulty", ""),
-            servings=data.get("servings"),
-            prep_time_minutes=data.get("prep_time_minutes"),
-            cook_time_minutes=data.get("cook_time_minutes"),
-            total_time_minutes=data.get("total_time_minutes"),
-            calories=data.get("calories"),
-            protein_grams=data.get("protein_grams"),
-            carbs_grams=data.get("carbs_grams"),
-            fat_grams=data.get("fat_grams"),
-            dietary_tags=data.get("dietary_tags", []),
-            keywords=data.get("keywords", []),
-            equipment=data.get("equipment", []),
-            ingredients=ingredients,
-            instructions=instructions,
-            method_used=ExtractionMethod.AUDIO,
+        Returns:
+            The JSON response text, or None if the model returned nothing
+        """
+        stream = await self._openai.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            response_format=RECIPE_RESPONSE_FORMAT,
+            temperature=0.1,
+            max_tokens=MAX_COMPLETION_TOKENS,
+            stream=True,
         )
+
+        parts: list[str] = []
+        head = ""
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                parts.append(chunk.choices[0].delta.content)
+                if len(head) < NO_RECIPE_SCAN_CHARS:
+                    head = "".join(parts)
+                    if _RE_NO_RECIPE.search(head):
+                        logger.info("LLM reported no recipe, closing stream early")
+                        return NO_RECIPE_RESPONSE
+
+        return "".join(parts) or None
+
+    async def _parse_transcript(self, transcript: str) -> Recipe | None:
+        """Use GPT-4o-mini to parse transcript into structured recipe."""
+        prompt = TRANSCRIPT_EXTRACTION_PROMPT.format(transcript=transcript)
+
+        content = await self._complete_json(prompt)
+        if not content:
+            return None
+
+        return recipe_from_response(orjson.loads(content), ExtractionMethod.AUDIO)
@@ -1,16 +1,87 @@
 """Base extractor interface and shared types."""
 
+import asyncio
+import logging
+import shutil
 from abc import ABC, abstractmethod
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
+from functools import lru_cache
 
+import httpx
+
+from app.config import get_settings
 from app.schemas import Recipe
+from app.services.cache import cache_key, get_video_info_cache
+from app.services.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# In-flight yt-dlp scrapes keyed like the video info cache
+_pending_info: dict[str, asyncio.Task[dict | None]] = {}
+
+# Downloaded media is written once and read straight back by ffmpeg, so it
+# goes to RAM-backed /dev/shm when that is big enough (containers often mount
+# only 64MB there); otherwise the platform temp dir is used
+SHM_DIR = "/dev/shm"
+MIN_SHM_BYTES = 1 << 30
 
 # Progress callback type: (message, percent) -> None
 # percent is 0.0 to 1.0
 ProgressCallback = Callable[[str, float], Awaitable[None]]
 
 
+def _extract_info_sync(url: str, ydl_opts: dict) -> dict | None:
+    """Run a blocking yt-dlp metadata scrape."""
+    # Imported on first use; loading yt-dlp's extractor registry is slow
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        return ydl.extract_info(url, download=False)
+
+
+def _download_sync(info: dict, ydl_opts: dict) -> None:
+    """Download media for a yt-dlp info dict (blocking).
+
+    Re-runs format selection on a clean copy of the (possibly cached) info
+    dict, the same way yt-dlp's --load-info-json does.
+    """
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.process_ie_result(ydl.sanitize_info(info, remove_private_keys=True), download=True)
+
+
+@lru_cache
+def get_scratch_dir() -> str | None:
+    """Get the directory for temporary media files, or None for the default."""
+    try:
+        if shutil.disk_usage(SHM_DIR).total >= MIN_SHM_BYTES:
+            return SHM_DIR
+    except OSError:
+        pass
+    return None
+
+
+@lru_cache
+def _get_scrape_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent yt-dlp scrapes."""
+    return asyncio.Semaphore(get_settings().max_concurrent_scrapes)
+
+
+async def _scrape_info(url: str, key: str, ydl_opts: dict) -> dict | None:
+    """Scrape video info in a worker thread and cache the result.
+
+    Concurrent scrapes are capped so bursts of requests don't trip
+    platform rate limits.
+    """
+    async with _get_scrape_semaphore():
+        info = await asyncio.to_thread(_extract_info_sync, url, ydl_opts)
+    if info:
+        get_video_info_cache().set(key, info)
+    return info
+
+
 @dataclass
 class ExtractionResult:
     """Result from an extraction attempt.
@@ -20,12 +91,15 @@ class ExtractionResult:
         recipe: The extracted recipe (if successful)
         should_fallback: Whether to try the next tier
         error: Error message if failed
+        transient: Whether the failure may not repeat on retry (network
+            errors, server errors, rate limits)
     """
 
     success: bool
     recipe: Recipe | None = None
     should_fallback: bool = False
     error: str | None = None
+    transient: bool = False
 
 
 class BaseExtractor(ABC):
@@ -35,13 +109,61 @@ class BaseExtractor(ABC):
     to allow fallback to the next tier on failure.
     """
 
-    def __init__(self, progress_callback: ProgressCallback | None = None) -> None:
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
         """Initialize extractor with optional progress callback.
 
         Args:
             progress_callback: Async function to report progress updates
+            http_client: HTTP client to use; defaults to the process-wide client
         """
         self._progress_callback = progress_callback
+        self._http = http_client or get_http_client()
+
+    async def _extract_video_info(self, url: str, ydl_opts: dict) -> dict | None:
+        """Fetch the yt-dlp info dict for a URL without downloading.
+
+        Info dicts are cached per URL so later tiers (and repeat requests)
+        skip the metadata scrape. Tiers that download media pass the cached
+        dict to `YoutubeDL.process_ie_result` with their own format options.
+        The scrape itself runs in a worker thread so it doesn't block the
+        event loop, and tiers running concurrently share one in-flight scrape.
+
+        Args:
+            url: Video URL to look up
+            ydl_opts: yt-dlp options used if the info is not cached
+
+        Returns:
+            The info dict, or None if yt-dlp returned nothing
+        """
+        cache = get_video_info_cache()
+        key = cache_key(url)
+        info = cache.get(key)
+        if info is not None:
+            logger.info(f"Using cached video info for {url}")
+            return info
+
+        task = _pending_info.get(key)
+        if task is None:
+            task = asyncio.create_task(_scrape_info(url, key, ydl_opts))
+            _pending_info[key] = task
+            task.add_done_callback(lambda _: _pending_info.pop(key, None))
+        # Shielded so a cancelled tier doesn't cancel the scrape for the others
+        return await asyncio.shield(task)
+
+    async def _download_from_info(self, info: dict, ydl_opts: dict) -> None:
+        """Download media for an info dict from `_extract_video_info`.
+
+        Runs in a worker thread so the download doesn't block the event loop.
+
+        Args:
+            info: yt-dlp info dict, possibly shared via the cache
+            ydl_opts: yt-dlp options selecting the format and output path
+        """
+        await asyncio.to_thread(_download_sync, info, ydl_opts)
 
     async def _report_progress(self, message: str, percent: float) -> None:
         """Report progress to the callback if one is registered.
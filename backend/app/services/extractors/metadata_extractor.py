@@ -4,36 +4,42 @@ Scrapes video description and captions using yt-dlp,
 then uses OpenAI to parse recipe information.
 """
 
-import json
+import asyncio
 import logging
 import re
 
 import httpx
-import yt_dlp
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI
 
-from app.config import get_settings
-from app.schemas import ExtractionMethod, Ingredient, Instruction, Recipe
+from app.schemas import ExtractionMethod, Recipe
+from app.services.cache import content_cache_key, get_llm_response_cache
 from app.services.extractors.base import BaseExtractor, ExtractionResult, ProgressCallback
+from app.services.extractors.recipe_builder import recipe_from_response
+from app.services.extractors.recipe_schema import RECIPE_RESPONSE_FORMAT
+from app.services.openai_clients import get_async_openai_client
 
 logger = logging.getLogger(__name__)
 
-RECIPE_EXTRACTION_PROMPT = """You are a professional chef and recipe extraction expert. Analyze the following video metadata (title, description, and captions) to extract a comprehensive, detailed recipe.
+# Model used to parse metadata into a recipe
+RECIPE_MODEL = "gpt-4o-mini"
 
-VIDEO METADATA:
-Title: {title}
+# Caption languages to look for, in order of preference
+CAPTION_LANGUAGES = ["en", "en-US", "en-GB", "en-orig"]
 
-Description:
-{description}
+# LLM calls per parse: the first attempt plus retries that feed the
+# validation error back to the model
+MAX_PARSE_ATTEMPTS = 3
 
-Captions/Subtitles (SPOKEN CONTENT - PRIMARY SOURCE):
-{captions}
+# Upper bound on videos processed at once by extract_batch
+MAX_CONCURRENT_BATCH_EXTRACTIONS = 8
 
-Creator: {creator}
-Creator URL: {creator_url}
+# Static instructions sent as the system message. Kept byte-identical across
+# calls (no placeholders) so OpenAI's automatic prompt caching can reuse it.
+RECIPE_EXTRACTION_PROMPT = """You are a professional chef and recipe extraction expert. Analyze the video metadata (title, description, and captions) provided by the user to extract a comprehensive, detailed recipe.
 
 Respond with valid JSON in this exact format:
-{{
+{
     "has_recipe": true,
     "title": "Recipe Name",
     "description": "Appetizing 2-3 sentence description of the dish, what makes it special, and what to expect",
@@ -51,7 +57,7 @@ Respond with valid JSON in this exact format:
     "keywords": ["pasta", "quick", "weeknight", "comfort food", "viral", etc],
     "equipment": ["large skillet", "mixing bowl", "whisk", "blender", etc],
     "ingredients": [
-        {{
+        {
             "raw_text": "2 cups all-purpose flour, sifted",
             "name": "all-purpose flour",
             "normalized_name": "all-purpose-flour",
@@ -61,21 +67,21 @@ Respond with valid JSON in this exact format:
             "category": "baking",
             "optional": false,
             "sort_order": 1
-        }}
+        }
     ],
     "instructions": [
-        {{
+        {
             "step_number": 1,
             "text": "Detailed instruction that explains the technique, visual cues, and what success looks like at this stage",
             "time_seconds": 300,
             "temperature": "350°F / 175°C",
             "tip": "Pro tip or common mistake to avoid"
-        }}
+        }
     ]
-}}
+}
 
 If no recipe found:
-{{"has_recipe": false}}
+{"has_recipe": false}
 
 CRITICAL - CAPTIONS ARE YOUR PRIMARY SOURCE:
 The captions contain exactly what the creator said in the video. Pay close attention to:
@@ -107,57 +113,121 @@ EXAMPLE OF A GOOD INSTRUCTION (based on what a creator might say):
 "Add your butter to a cold pan - this is key, don't heat the pan first! Turn the heat to medium and let the butter melt slowly, swirling occasionally. You want it to foam up and then the foam will subside. Keep watching for little brown specks at the bottom and that nutty smell - that's when you know it's browned butter. This takes about 4-5 minutes. Don't walk away or it'll burn!"
 """
 
+# Per-video metadata sent as the user message, after the cacheable prefix
+VIDEO_METADATA_TEMPLATE = """VIDEO METADATA:
+Title: {title}
 
-def _normalize_name(name: str) -> str:
-    """Convert ingredient name to normalized format."""
-    normalized = name.lower().strip()
-    normalized = re.sub(r"[^a-z0-9\s-]", "", normalized)
-    normalized = re.sub(r"\s+", "-", normalized)
-    return normalized
+Description:
+{description}
 
+Captions/Subtitles (SPOKEN CONTENT - PRIMARY SOURCE):
+{captions}
 
-def _parse_vtt_to_text(vtt_content: str) -> str:
-    """Parse VTT subtitle content to plain text.
+Creator: {creator}
+Creator URL: {creator_url}
+"""
+
+# Caption budget sent to the LLM, in tokens. Long transcripts keep the
+# opening (ingredients are usually introduced early) and the ending (recaps
+# and final steps) and drop the middle.
+CAPTION_HEAD_TOKENS = 1800
+CAPTION_TAIL_TOKENS = 700
+# English caption text averages about four characters per token
+CHARS_PER_TOKEN = 4
 
-    Removes timestamps, cue identifiers, and HTML-like tags.
+# Inline caption markup such as <c>, </c>, <b>, and <00:00:01.500> timestamps
+_RE_VTT_TAG = re.compile(r"<[^>]+>")
+
+
+def _word_overlap(prev: list[str], cur: list[str]) -> int:
+    """Return the length of the longest suffix of prev that prefixes cur."""
+    for k in range(min(len(prev), len(cur)), 0, -1):
+        if prev[-k:] == cur[:k]:
+            return k
+    return 0
+
+
+class _CaptionTextBuilder:
+    """Incrementally converts VTT subtitle lines to plain text.
+
+    Lines can be fed as they arrive from a streamed download, so parsing
+    overlaps the transfer instead of waiting for the full body.
     """
-    lines = []
-    for line in vtt_content.split("\n"):
+
+    def __init__(self) -> None:
+        self._words: list[str] = []
+        self._prev: str | None = None
+
+    def add_line(self, line: str) -> None:
+        """Add one raw subtitle line.
+
+        Removes timestamps, cue identifiers, and HTML-like tags. Auto-generated
+        captions repeat a rolling window of words from cue to cue, so each line
+        is merged on its longest word overlap with the text so far rather than
+        appended whole.
+        """
         line = line.strip()
-        # Skip WEBVTT header
-        if line.startswith("WEBVTT"):
-            continue
-        # Skip timestamp lines (00:00:00.000 --> 00:00:05.000)
-        if "-->" in line:
-            continue
-        # Skip numeric cue identifiers
-        if line.isdigit():
-            continue
-        # Skip empty lines and NOTE lines
-        if not line or line.startswith("NOTE"):
-            continue
-        # Remove HTML-like tags (<c>, </c>, <b>, etc.)
-        line = re.sub(r"<[^>]+>", "", line)
-        # Skip if empty after tag removal
-        if line:
-            lines.append(line)
-
-    # Remove consecutive duplicates (common in VTT)
-    deduped = []
-    for line in lines:
-        if not deduped or line != deduped[-1]:
-            deduped.append(line)
-
-    return " ".join(deduped)
+        if not line:
+            return
+        # Skip the WEBVTT header, NOTE blocks, timestamp lines
+        # (00:00:00.000 --> 00:00:05.000), and numeric cue identifiers. Each
+        # starts with W, N, or a digit, so caption text, the bulk of the file,
+        # is classified by its first character alone.
+        first = line[0]
+        if first in "WN":
+            if line.startswith(("WEBVTT", "NOTE")):
+                return
+        elif first.isdigit() and ("-->" in line or line.isdigit()):
+            return
+        # Remove HTML-like tags (<c>, </c>, <b>, etc.); most lines have none
+        if "<" in line:
+            line = _RE_VTT_TAG.sub("", line)
+        # Skip if empty after tag removal or a repeat of the previous line
+        # (common in VTT)
+        if not line or line == self._prev:
+            return
+        cur = line.split()
+        self._words.extend(cur[_word_overlap(self._words, cur):])
+        self._prev = line
+
+    def text(self) -> str:
+        """Return the caption text built so far."""
+        return " ".join(self._words)
+
+
+def _parse_vtt_to_text(vtt_content: str) -> str:
+    """Parse VTT subtitle content to plain text."""
+    builder = _CaptionTextBuilder()
+    for line in vtt_content.split("\n"):
+        builder.add_line(line)
+    return builder.text()
+
+
+def _truncate_captions(captions: str) -> str:
+    """Trim captions to the token budget, keeping the head and tail.
+
+    Cuts fall on word boundaries so no partial words reach the prompt.
+    """
+    head_chars = CAPTION_HEAD_TOKENS * CHARS_PER_TOKEN
+    tail_chars = CAPTION_TAIL_TOKENS * CHARS_PER_TOKEN
+    if len(captions) <= head_chars + tail_chars:
+        return captions
+    head = captions[:head_chars].rsplit(" ", 1)[0]
+    tail = captions[-tail_chars:].split(" ", 1)[-1]
+    return f"{head} ... {tail}"
 
 
 class MetadataExtractor(BaseExtractor):
     """Extracts recipe from video metadata using yt-dlp and OpenAI."""
 
-    def __init__(self, progress_callback: ProgressCallback | None = None) -> None:
-        super().__init__(progress_callback)
-        settings = get_settings()
-        self._openai = OpenAI(api_key=settings.openai_api_key)
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        openai_client: AsyncOpenAI | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        super().__init__(progress_callback, http_client)
+        self._openai = openai_client or get_async_openai_client()
 
     @property
     def tier_name(self) -> str:
@@ -178,7 +248,9 @@ class MetadataExtractor(BaseExtractor):
 
             await self._report_progress("Extracting captions...", 0.3)
 
-            captions = await self._extract_captions(metadata.get("_info", {}))
+            captions = await self._extract_captions(
+                metadata.get("caption"), metadata.get("caption_source")
+            )
             metadata["captions"] = captions
 
             await self._report_progress("Analyzing content with AI...", 0.5)
@@ -209,6 +281,27 @@ class MetadataExtractor(BaseExtractor):
                 error=str(e),
             )
 
+    async def extract_batch(self, urls: list[str]) -> list[ExtractionResult]:
+        """Extract recipes from several videos concurrently.
+
+        Each URL runs its own scrape, caption fetch, and LLM call, so one
+        video's caption download overlaps another's completion instead of
+        every stage waiting on the slowest video in the batch.
+
+        Args:
+            urls: Video URLs to extract from
+
+        Returns:
+            One ExtractionResult per URL, in input order
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCH_EXTRACTIONS)
+
+        async def extract_with_semaphore(url: str) -> ExtractionResult:
+            async with semaphore:
+                return await self.extract(url)
+
+        return list(await asyncio.gather(*(extract_with_semaphore(u) for u in urls)))
+
     async def _fetch_metadata(self, url: str) -> dict | None:
         """Fetch video metadata using yt-dlp."""
         ydl_opts = {
@@ -219,13 +312,11 @@ class MetadataExtractor(BaseExtractor):
             # Caption extraction options
             "writeautomaticsub": True,
             "writesubtitles": True,
-            "subtitleslangs": ["en", "en-US", "en-GB", "en-orig"],
+            "subtitleslangs": CAPTION_LANGUAGES,
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-
+            info = await self._extract_video_info(url, ydl_opts)
             if not info:
                 return None
 
@@ -235,16 +326,19 @@ class MetadataExtractor(BaseExtractor):
             title = info.get("title", "")
             description = info.get("description", "")
 
-            logger.info("=== METADATA FETCHED ===")
-            logger.info(f"Title: {title}")
-            logger.info(f"Creator: {creator}")
-            logger.info(f"Description (first 500 chars): {description[:500]}...")
-
             # Check for available subtitles
             subtitles = info.get("subtitles", {})
             auto_captions = info.get("automatic_captions", {})
-            logger.info(f"Manual subtitles available: {list(subtitles.keys())}")
-            logger.info(f"Auto captions available: {list(auto_captions.keys())}")
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("=== METADATA FETCHED ===")
+                logger.info(f"Title: {title}")
+                logger.info(f"Creator: {creator}")
+                logger.info(f"Description (first 500 chars): {description[:500]}...")
+                logger.info(f"Manual subtitles available: {list(subtitles.keys())}")
+                logger.info(f"Auto captions available: {list(auto_captions.keys())}")
+
+            caption, caption_source = self._select_caption(subtitles, auto_captions)
 
             return {
                 "title": title,
@@ -252,65 +346,71 @@ class MetadataExtractor(BaseExtractor):
                 "thumbnail": info.get("thumbnail"),
                 "creator": creator,
                 "creator_url": creator_url,
-                "_info": info,  # Keep full info for caption extraction
+                "caption": caption,
+                "caption_source": caption_source,
             }
 
         except Exception as e:
             logger.warning(f"yt-dlp metadata fetch failed: {e}")
             return None
 
-    async def _extract_captions(self, info: dict) -> str:
-        """Extract captions/subtitles from video info.
+    def _select_caption(
+        self, subtitles: dict, auto_captions: dict
+    ) -> tuple[dict | None, str | None]:
+        """Pick the caption track to use for a video.
 
         Priority:
         1. Manual subtitles (creator-provided)
         2. Auto-generated captions
-        """
-        if not info:
-            return ""
-
-        subtitles = info.get("subtitles", {})
-        auto_captions = info.get("automatic_captions", {})
 
+        Returns:
+            The chosen caption format and a label describing its source,
+            or (None, None) if no English captions are available
+        """
         # Try manual subtitles first (higher quality)
-        caption_url = None
-        caption_source = None
-
-        for lang in ["en", "en-US", "en-GB", "en-orig"]:
+        for lang in CAPTION_LANGUAGES:
             if lang in subtitles:
-                formats = subtitles[lang]
-                caption_url = self._get_best_caption_url(formats)
-                if caption_url:
-                    caption_source = f"manual ({lang})"
-                    break
+                caption = self._get_best_caption(subtitles[lang])
+                if caption:
+                    return caption, f"manual ({lang})"
 
         # Fall back to auto captions
-        if not caption_url:
-            for lang in ["en", "en-US", "en-GB", "en-orig"]:
-                if lang in auto_captions:
-                    formats = auto_captions[lang]
-                    caption_url = self._get_best_caption_url(formats)
-                    if caption_url:
-                        caption_source = f"auto ({lang})"
-                        break
-
-        if not caption_url:
+        for lang in CAPTION_LANGUAGES:
+            if lang in auto_captions:
+                caption = self._get_best_caption(auto_captions[lang])
+                if caption:
+                    return caption, f"auto ({lang})"
+
+        return None, None
+
+    async def _extract_captions(self, caption: dict | None, caption_source: str | None) -> str:
+        """Get plain caption text for the caption format chosen by _select_caption."""
+        if not caption:
             logger.info("No captions available for this video")
             return ""
 
-        logger.info(f"Fetching {caption_source} captions from: {caption_url[:100]}...")
-
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(caption_url)
-                response.raise_for_status()
-                content = response.text
-
-            # Parse VTT/SRT to plain text
-            text = _parse_vtt_to_text(content)
-
-            logger.info(f"Extracted {len(text)} characters of caption text")
-            logger.info(f"Caption preview: {text[:500]}...")
+            # Some extractors return the subtitle body inline with the info
+            # dict; only fetch when all we have is a URL
+            content = caption.get("data")
+            if content:
+                logger.info(f"Using inline {caption_source} captions")
+                # Parse VTT/SRT to plain text
+                text = _parse_vtt_to_text(content)
+            else:
+                caption_url = caption["url"]
+                logger.info(f"Fetching {caption_source} captions from: {caption_url[:100]}...")
+                # Parse lines as they stream in rather than buffering the body
+                builder = _CaptionTextBuilder()
+                async with self._http.stream("GET", caption_url, timeout=30.0) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        builder.add_line(line)
+                text = builder.text()
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"Extracted {len(text)} characters of caption text")
+                logger.info(f"Caption preview: {text[:500]}...")
 
             return text
 
@@ -318,29 +418,29 @@ class MetadataExtractor(BaseExtractor):
             logger.warning(f"Failed to fetch captions: {e}")
             return ""
 
-    def _get_best_caption_url(self, formats: list[dict]) -> str | None:
-        """Get the best caption URL from available formats.
+    def _get_best_caption(self, formats: list[dict]) -> dict | None:
+        """Get the best caption format from available formats.
 
-        Prefers VTT, then SRT, then any other format.
+        Prefers VTT, then SRT, then any other format. A format is usable if
+        it has inline `data` or a `url` to fetch.
         """
-        vtt_url = None
-        srt_url = None
-        any_url = None
+        vtt = None
+        srt = None
+        other = None
 
         for fmt in formats:
-            url = fmt.get("url")
-            if not url:
+            if not fmt.get("data") and not fmt.get("url"):
                 continue
 
             ext = fmt.get("ext", "")
             if ext == "vtt":
-                vtt_url = url
+                vtt = fmt
             elif ext == "srt":
-                srt_url = url
-            elif not any_url:
-                any_url = url
+                srt = fmt
+            elif not other:
+                other = fmt
 
-        return vtt_url or srt_url or any_url
+        return vtt or srt or other
 
     async def _parse_with_openai(self, metadata: dict) -> Recipe | None:
         """Use OpenAI to parse metadata into structured recipe."""
@@ -348,11 +448,11 @@ class MetadataExtractor(BaseExtractor):
 
         # If we have good captions, they're the primary source
         if len(captions_text) > 100:
-            captions_display = captions_text[:8000]  # Limit for context
+            captions_display = _truncate_captions(captions_text)
         else:
             captions_display = "No captions available"
 
-        prompt = RECIPE_EXTRACTION_PROMPT.format(
+        video_metadata = VIDEO_METADATA_TEMPLATE.format(
             title=metadata.get("title", ""),
             description=metadata.get("description", ""),
             captions=captions_display,
@@ -360,92 +460,49 @@ class MetadataExtractor(BaseExtractor):
             creator_url=metadata.get("creator_url", ""),
         )
 
-        response = self._openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
-
-        content = response.choices[0].message.content
-        if not content:
-            return None
-
-        data = json.loads(content)
-
-        logger.info("=== LLM RESPONSE ===")
-        logger.info(f"has_recipe: {data.get('has_recipe')}")
-        logger.info(f"title: {data.get('title')}")
-        logger.info(f"ingredients count: {len(data.get('ingredients', []))}")
-        logger.info(f"instructions count: {len(data.get('instructions', []))}")
-
-        if not data.get("has_recipe"):
-            logger.info("LLM determined no recipe in metadata")
-            return None
+        # Identical metadata yields an identical prompt, so reuse the response.
+        # Only validated responses are cached.
+        llm_cache = get_llm_response_cache()
+        cache_key = content_cache_key(RECIPE_MODEL, RECIPE_EXTRACTION_PROMPT, video_metadata)
+        data = llm_cache.get(cache_key)
+        if data is not None:
+            logger.info("Using cached LLM response for metadata")
+            return recipe_from_response(data, ExtractionMethod.METADATA)
+
+        messages = [
+            {"role": "system", "content": RECIPE_EXTRACTION_PROMPT},
+            {"role": "user", "content": video_metadata},
+        ]
+        for attempt in range(1, MAX_PARSE_ATTEMPTS + 1):
+            response = await self._openai.chat.completions.create(
+                model=RECIPE_MODEL,
+                messages=messages,
+                response_format=RECIPE_RESPONSE_FORMAT,
+                temperature=0.1,
+            )
 
-        # Validate we have actual recipe content
-        if not data.get("ingredients") or not data.get("instructions"):
-            logger.info("LLM returned has_recipe=true but missing ingredients or instructions")
-            return None
+            content = response.choices[0].message.content
+            if not content:
+                return None
 
-        logger.info("=== EXTRACTED INGREDIENTS ===")
-        for i, ing in enumerate(data.get("ingredients", [])[:5]):
-            logger.info(f"  {i+1}. {ing.get('raw_text', ing.get('name', 'unknown'))}")
-        if len(data.get("ingredients", [])) > 5:
-            logger.info(f"  ... and {len(data['ingredients']) - 5} more")
-
-        logger.info("=== EXTRACTED INSTRUCTIONS ===")
-        for i, inst in enumerate(data.get("instructions", [])[:3]):
-            logger.info(f"  Step {inst.get('step_number', i+1)}: {inst.get('text', '')[:100]}...")
-        if len(data.get("instructions", [])) > 3:
-            logger.info(f"  ... and {len(data['instructions']) - 3} more steps")
-
-        ingredients = []
-        for idx, i in enumerate(data.get("ingredients", [])):
-            quantity = i.get("quantity")
-            ingredients.append(
-                Ingredient(
-                    raw_text=i.get("raw_text") or f"{quantity or ''} {i.get('unit', '')} {i.get('name', '')}".strip(),
-                    name=i.get("name") or "",
-                    normalized_name=i.get("normalized_name") or _normalize_name(i.get("name") or ""),
-                    quantity=float(quantity) if quantity is not None else 0.0,
-                    unit=i.get("unit") or "",
-                    preparation=i.get("preparation") or "",
-                    category=i.get("category") or "",
-                    optional=bool(i.get("optional")),
-                    sort_order=i.get("sort_order") or idx + 1,
+            try:
+                data = orjson.loads(content)
+                recipe = recipe_from_response(data, ExtractionMethod.METADATA)
+            except (ValueError, KeyError, TypeError) as e:
+                # Show the model its output and the error so it can correct
+                # itself, rather than escalating to the far costlier tiers
+                logger.warning(f"Invalid LLM response (attempt {attempt}/{MAX_PARSE_ATTEMPTS}): {e}")
+                messages.append({"role": "assistant", "content": content})
+                messages.append(
+                    {
+                        "role": "user",
+                        "content": f"Your output had an error: {e}. "
+                        "Respond with valid JSON matching the schema.",
+                    }
                 )
-            )
+                continue
 
-        instructions = []
-        for idx, inst in enumerate(data.get("instructions", [])):
-            instructions.append(
-                Instruction(
-                    step_number=inst.get("step_number", idx + 1),
-                    text=inst.get("text", ""),
-                    time_seconds=inst.get("time_seconds"),
-                    temperature=inst.get("temperature"),
-                    tip=inst.get("tip"),
-                )
-            )
+            llm_cache.set(cache_key, data)
+            return recipe
 
-        return Recipe(
-            title=data["title"],
-            description=data.get("description", ""),
-            cuisine=data.get("cuisine", ""),
-            difficulty=data.get("difficulty", ""),
-            servings=data.get("servings"),
-            prep_time_minutes=data.get("prep_time_minutes"),
-            cook_time_minutes=data.get("cook_time_minutes"),
-            total_time_minutes=data.get("total_time_minutes"),
-            calories=data.get("calories"),
-            protein_grams=data.get("protein_grams"),
-            carbs_grams=data.get("carbs_grams"),
-            fat_grams=data.get("fat_grams"),
-            dietary_tags=data.get("dietary_tags", []),
-            keywords=data.get("keywords", []),
-            equipment=data.get("equipment", []),
-            ingredients=ingredients,
-            instructions=instructions,
-            method_used=ExtractionMethod.METADATA,
-        )
+        return None
@@ -0,0 +1,27 @@
+"""Ingredient name normalization shared by the extraction tiers."""
+
+
+class _NameCharTable(dict):
+    """str.translate table keeping [a-z0-9-] and whitespace, dropping the rest.
+
+    Characters outside the precomputed keep-set are resolved on first use
+    and memoized, so any Unicode input is handled.
+    """
+
+    def __missing__(self, codepoint: int) -> int | None:
+        value = codepoint if chr(codepoint).isspace() else None
+        self[codepoint] = value
+        return value
+
+
+# Ingredient name normalization table, built once at import
+_NAME_TABLE = _NameCharTable({ord(c): ord(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789-"})
+
+
+def normalize_name(name: str) -> str:
+    """Convert ingredient name to normalized format.
+
+    Drops anything but lowercase letters, digits, hyphens and whitespace in
+    one translate pass, then joins the remaining words with hyphens.
+    """
+    return "-".join(name.lower().translate(_NAME_TABLE).split())
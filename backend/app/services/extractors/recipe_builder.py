@@ -0,0 +1,155 @@
+"""Recipe building shared by the LLM-backed extraction tiers.
+
+Every tier asks the model for the same JSON shape (see recipe_schema), so
+the response is checked and turned into a Recipe in one place.
+"""
+
+import logging
+
+from app.schemas import ExtractionMethod, Recipe
+from app.services.cache import TTLCache
+from app.services.extractors.normalize import normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+def recipe_from_data(data: dict, method: ExtractionMethod) -> Recipe:
+    """Build a Recipe from an LLM JSON response.
+
+    Ingredients and instructions are assembled as plain dicts and the whole
+    recipe is validated in one model_validate call. Nullable values allowed
+    by the strict schema (quantity, sort_order) are filled in here.
+
+    Args:
+        data: Decoded LLM response
+        method: Tier recorded as the recipe's extraction method
+
+    Raises:
+        ValueError: If the recipe fails validation
+        KeyError: If the response has no title
+    """
+    ingredients = []
+    for idx, i in enumerate(data.get("ingredients", [])):
+        quantity = i.get("quantity")
+        ingredients.append(
+            {
+                "raw_text": i.get("raw_text")
+                or f"{quantity or ''} {i.get('unit', '')} {i.get('name', '')}".strip(),
+                "name": i.get("name") or "",
+                "normalized_name": i.get("normalized_name") or normalize_name(i.get("name") or ""),
+                "quantity": float(quantity) if quantity is not None else 0.0,
+                "unit": i.get("unit") or "",
+                "preparation": i.get("preparation") or "",
+                "category": i.get("category") or "",
+                "optional": bool(i.get("optional")),
+                "sort_order": i.get("sort_order") or idx + 1,
+            }
+        )
+
+    instructions = [
+        {
+            "step_number": inst.get("step_number", idx + 1),
+            "text": inst.get("text", ""),
+            "time_seconds": inst.get("time_seconds"),
+            "temperature": inst.get("temperature"),
+            "tip": inst.get("tip"),
+        }
+        for idx, inst in enumerate(data.get("instructions", []))
+    ]
+
+    return Recipe.model_validate(
+        {
+            "title": data["title"],
+            "description": data.get("description", ""),
+            "cuisine": data.get("cuisine", ""),
+            "difficulty": data.get("difficulty", ""),
+            "servings": data.get("servings"),
+            "prep_time_minutes": data.get("prep_time_minutes"),
+            "cook_time_minutes": data.get("cook_time_minutes"),
+            "total_time_minutes": data.get("total_time_minutes"),
+            "calories": data.get("calories"),
+            "protein_grams": data.get("protein_grams"),
+            "carbs_grams": data.get("carbs_grams"),
+            "fat_grams": data.get("fat_grams"),
+            "dietary_tags": data.get("dietary_tags", []),
+            "keywords": data.get("keywords", []),
+            "equipment": data.get("equipment", []),
+            "ingredients": ingredients,
+            "instructions": instructions,
+            "method_used": method,
+        }
+    )
+
+
+def _log_response(data: dict, method: ExtractionMethod) -> None:
+    """Log a summary of an LLM response and the first ingredients and steps."""
+    ingredients = data.get("ingredients") or []
+    instructions = data.get("instructions") or []
+    logger.info(f"=== {method.upper()} LLM RESPONSE ===")
+    logger.info(f"has_recipe: {data.get('has_recipe')}")
+    logger.info(f"title: {data.get('title')}")
+    logger.info(f"ingredients count: {len(ingredients)}")
+    logger.info(f"instructions count: {len(instructions)}")
+    if not data.get("has_recipe") or not ingredients or not instructions:
+        return
+
+    logger.info(f"=== EXTRACTED INGREDIENTS (from {method}) ===")
+    for i, ing in enumerate(ingredients[:5]):
+        logger.info(f"  {i + 1}. {ing.get('raw_text', ing.get('name', 'unknown'))}")
+    if len(ingredients) > 5:
+        logger.info(f"  ... and {len(ingredients) - 5} more")
+
+    logger.info(f"=== EXTRACTED INSTRUCTIONS (from {method}) ===")
+    for i, inst in enumerate(instructions[:3]):
+        logger.info(f"  Step {inst.get('step_number', i + 1)}: {inst.get('text', '')[:100]}...")
+    if len(instructions) > 3:
+        logger.info(f"  ... and {len(instructions) - 3} more steps")
+
+
+def recipe_from_response(data: dict, method: ExtractionMethod) -> Recipe | None:
+    """Check an LLM JSON response and build a Recipe from it.
+
+    Args:
+        data: Decoded LLM response
+        method: Tier recorded as the recipe's extraction method
+
+    Returns:
+        The Recipe, or None if the LLM found no recipe
+
+    Raises:
+        ValueError: If the response claims a recipe but is incomplete or invalid
+        KeyError: If the response claims a recipe but has no title
+    """
+    if logger.isEnabledFor(logging.INFO):
+        _log_response(data, method)
+
+    if not data.get("has_recipe"):
+        logger.info(f"LLM determined no recipe ({method})")
+        return None
+
+    # Validate we have actual recipe content
+    if not data.get("ingredients") or not data.get("instructions"):
+        raise ValueError("has_recipe is true but ingredients or instructions are missing")
+
+    return recipe_from_data(data, method)
+
+
+def recipe_from_cached_response(
+    data: dict, method: ExtractionMethod, cache: TTLCache[dict], key: str
+) -> Recipe | None:
+    """Build a Recipe from an LLM response held in the LLM response cache.
+
+    Like recipe_from_response, but evicts the cache entry when the response
+    is invalid, so it isn't served again.
+
+    Args:
+        data: Decoded LLM response
+        method: Tier recorded as the recipe's extraction method
+        cache: Cache the response was read from or stored in
+        key: The response's cache key
+    """
+    try:
+        return recipe_from_response(data, method)
+    except (ValueError, KeyError, TypeError):
+        cache.delete(key)
+        raise
@@ -0,0 +1,76 @@
+"""Structured-output schema for LLM recipe extraction.
+
+Mirrors the JSON format described in the extraction prompts so the API
+enforces the response shape server-side instead of us repairing it.
+`has_recipe` comes first so a negative answer is the first thing generated.
+Strict mode requires every property, so optional values are nullable.
+"""
+
+_NULLABLE_INTEGER = {"type": ["integer", "null"]}
+_NULLABLE_NUMBER = {"type": ["number", "null"]}
+_NULLABLE_STRING = {"type": ["string", "null"]}
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+
+def _object(properties: dict) -> dict:
+    """Build a strict object schema where every property is required."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+_INGREDIENT_SCHEMA = _object(
+    {
+        "raw_text": {"type": "string"},
+        "name": {"type": "string"},
+        "normalized_name": {"type": "string"},
+        "quantity": _NULLABLE_NUMBER,
+        "unit": {"type": "string"},
+        "preparation": {"type": "string"},
+        "category": {"type": "string"},
+        "optional": {"type": "boolean"},
+        "sort_order": _NULLABLE_INTEGER,
+    }
+)
+
+_INSTRUCTION_SCHEMA = _object(
+    {
+        "step_number": {"type": "integer"},
+        "text": {"type": "string"},
+        "time_seconds": _NULLABLE_INTEGER,
+        "temperature": _NULLABLE_STRING,
+        "tip": _NULLABLE_STRING,
+    }
+)
+
+RECIPE_SCHEMA = _object(
+    {
+        "has_recipe": {"type": "boolean"},
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "cuisine": {"type": "string"},
+        "difficulty": {"type": "string"},
+        "servings": _NULLABLE_INTEGER,
+        "prep_time_minutes": _NULLABLE_INTEGER,
+        "cook_time_minutes": _NULLABLE_INTEGER,
+        "total_time_minutes": _NULLABLE_INTEGER,
+        "calories": _NULLABLE_INTEGER,
+        "protein_grams": _NULLABLE_NUMBER,
+        "carbs_grams": _NULLABLE_NUMBER,
+        "fat_grams": _NULLABLE_NUMBER,
+        "dietary_tags": _STRING_LIST,
+        "keywords": _STRING_LIST,
+        "equipment": _STRING_LIST,
+        "ingredients": {"type": "array", "items": _INGREDIENT_SCHEMA},
+        "instructions": {"type": "array", "items": _INSTRUCTION_SCHEMA},
+    }
+)
+
+# `response_format` value for chat completions using the recipe schema
+RECIPE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "recipe", "schema": RECIPE_SCHEMA, "strict": True},
+}
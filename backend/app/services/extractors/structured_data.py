@@ -0,0 +1,323 @@
+"""schema.org Recipe parsing for the website tier.
+
+Most recipe sites embed their recipe as JSON-LD for search engines. When it
+has ingredients and instructions, the recipe is built from it directly and
+the LLM call is skipped.
+"""
+
+import html
+import logging
+import math
+import re
+from collections.abc import Iterable, Iterator
+
+import orjson
+
+from app.schemas import ExtractionMethod, Recipe
+from app.services.extractors.normalize import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# ISO 8601 durations such as "PT1H30M" or "P0DT0H20M"
+_RE_DURATION = re.compile(
+    r"P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?",
+    re.IGNORECASE,
+)
+_RE_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_PARENTHETICAL = re.compile(r"\([^)]*\)")
+_RE_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+# Leading ingredient quantities: "1 1/2", "1/2", "1.5", "1½" or "½"
+_UNICODE_FRACTIONS = {
+    "½": 1 / 2,
+    "⅓": 1 / 3,
+    "⅔": 2 / 3,
+    "¼": 1 / 4,
+    "¾": 3 / 4,
+    "⅕": 1 / 5,
+    "⅛": 1 / 8,
+    "⅜": 3 / 8,
+    "⅝": 5 / 8,
+    "⅞": 7 / 8,
+}
+_FRACTION_CHARS = "".join(_UNICODE_FRACTIONS)
+_RE_QUANTITY = re.compile(
+    rf"(?:(?P<whole>\d+)\s+)?(?P<num>\d+)/(?P<den>\d+)"
+    rf"|(?P<number>\d+(?:\.\d+)?)?\s*(?P<fraction>[{_FRACTION_CHARS}])"
+    rf"|(?P<plain>\d+(?:\.\d+)?)"
+)
+# Upper bound of a range ("2-3 cups", "2 to 3 cups"), which is dropped
+_RE_RANGE_END = re.compile(rf"\s*(?:-|–|to\b)\s*[\d{_FRACTION_CHARS}][\d./]*")
+
+# Units recognised after an ingredient quantity, by their lowercased spelling
+INGREDIENT_UNITS = frozenset(
+    {
+        "cup",
+        "cups",
+        "c",
+        "tablespoon",
+        "tablespoons",
+        "tbsp",
+        "tbs",
+        "tbl",
+        "teaspoon",
+        "teaspoons",
+        "tsp",
+        "ounce",
+        "ounces",
+        "oz",
+        "fl oz",
+        "pound",
+        "pounds",
+        "lb",
+        "lbs",
+        "gram",
+        "grams",
+        "g",
+        "kilogram",
+        "kilograms",
+        "kg",
+        "milliliter",
+        "milliliters",
+        "millilitre",
+        "millilitres",
+        "ml",
+        "liter",
+        "liters",
+        "litre",
+        "litres",
+        "l",
+        "quart",
+        "quarts",
+        "qt",
+        "pint",
+        "pints",
+        "pt",
+        "gallon",
+        "gallons",
+        "pinch",
+        "pinches",
+        "dash",
+        "dashes",
+        "handful",
+        "handfuls",
+        "clove",
+        "cloves",
+        "can",
+        "cans",
+        "jar",
+        "jars",
+        "package",
+        "packages",
+        "pkg",
+        "stick",
+        "sticks",
+        "slice",
+        "slices",
+        "piece",
+        "pieces",
+        "bunch",
+        "bunches",
+        "sprig",
+        "sprigs",
+        "head",
+        "heads",
+    }
+)
+
+
+def _text(value: object) -> str:
+    """Coerce a JSON-LD text value to plain text, decoding entities and tags."""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if isinstance(value, dict):
+        value = value.get("name") or value.get("text") or ""
+    if not isinstance(value, str):
+        return "" if value is None else str(value)
+    return " ".join(html.unescape(_RE_TAG.sub(" ", value)).split())
+
+
+def _text_list(value: object) -> list[str]:
+    """Coerce a JSON-LD list or comma-separated string to a list of texts."""
+    if isinstance(value, str):
+        items: Iterable[object] = value.split(",")
+    elif isinstance(value, list):
+        items = value
+    elif value:
+        items = [value]
+    else:
+        items = []
+    return [text for item in items if (text := _text(item))]
+
+
+def _minutes(value: object) -> int | None:
+    """Convert an ISO 8601 duration to whole minutes."""
+    match = _RE_DURATION.fullmatch(_text(value))
+    if not match or not any(match.groups()):
+        return None
+    parts = {name: int(v) if v else 0 for name, v in match.groupdict().items()}
+    return (
+        parts["days"] * 1440 + parts["hours"] * 60 + parts["minutes"] + round(parts["seconds"] / 60)
+    )
+
+
+def _first_number(value: object) -> float | None:
+    """Return the first number in a value such as "450 kcal" or ["4", "4 servings"]."""
+    if isinstance(value, int | float):
+        return float(value)
+    match = _RE_NUMBER.search(_text(value))
+    return float(match.group()) if match else None
+
+
+def _parse_ingredient(line: str, sort_order: int) -> dict:
+    """Split an ingredient line like "1 1/2 cups flour, sifted" into its parts."""
+    rest = line
+    quantity = 0.0
+    match = _RE_QUANTITY.match(rest)
+    if match:
+        if match["num"]:
+            if int(match["den"]):
+                quantity = int(match["whole"] or 0) + int(match["num"]) / int(match["den"])
+        elif match["fraction"]:
+            quantity = float(match["number"] or 0) + _UNICODE_FRACTIONS[match["fraction"]]
+        else:
+            quantity = float(match["plain"])
+        rest = rest[match.end() :]
+        range_end = _RE_RANGE_END.match(rest)
+        if range_end:
+            rest = rest[range_end.end() :]
+
+    # Parentheticals like "(14 oz)" or "(boneless)" are neither unit nor name
+    unit = ""
+    words = _RE_PARENTHETICAL.sub(" ", rest).split()
+    for size in (2, 1):
+        candidate = " ".join(words[:size]).lower().rstrip(".")
+        if len(words) > size and candidate in INGREDIENT_UNITS:
+            unit = " ".join(words[:size]).rstrip(".")
+            words = words[size:]
+            break
+
+    name, _, preparation = " ".join(words).partition(",")
+    optional = "optional" in line.lower()
+    name = name.strip().removeprefix("of ")
+    preparation = preparation.strip()
+    if optional:
+        preparation = " ".join(preparation.replace("optional", "").split()).strip(" ,")
+
+    return {
+        "raw_text": line,
+        "name": name,
+        "normalized_name": normalize_name(name),
+        "quantity": round(quantity, 3),
+        "unit": unit,
+        "preparation": preparation,
+        "optional": optional,
+        "sort_order": sort_order,
+    }
+
+
+def _instruction_texts(value: object) -> Iterator[str]:
+    """Flatten recipeInstructions (text, HowToStep, HowToSection) into step texts."""
+    if isinstance(value, str):
+        yield from (line for line in (_text(part) for part in value.splitlines()) if line)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _instruction_texts(item)
+    elif isinstance(value, dict):
+        if "itemListElement" in value:
+            yield from _instruction_texts(value["itemListElement"])
+        elif text := _text(value.get("text") or value.get("name")):
+            yield text
+
+
+def _diet_tag(value: str) -> str:
+    """Turn a schema.org diet such as "https://schema.org/GlutenFreeDiet" into "gluten-free"."""
+    name = value.rsplit("/", 1)[-1].removesuffix("Diet")
+    return _RE_CAMEL_BOUNDARY.sub("-", name).lower()
+
+
+def _is_recipe(node: dict) -> bool:
+    node_type = node.get("@type")
+    return node_type == "Recipe" or (isinstance(node_type, list) and "Recipe" in node_type)
+
+
+def _find_recipe(node: object) -> dict | None:
+    """Depth-first search of a JSON-LD document for a Recipe node."""
+    if isinstance(node, list):
+        for item in node:
+            if (found := _find_recipe(item)) is not None:
+                return found
+    elif isinstance(node, dict):
+        if _is_recipe(node):
+            return node
+        for key in ("@graph", "mainEntity", "mainEntityOfPage"):
+            if (found := _find_recipe(node.get(key))) is not None:
+                return found
+    return None
+
+
+def recipe_from_json_ld(blocks: Iterable[str]) -> Recipe | None:
+    """Build a Recipe from a page's JSON-LD script contents.
+
+    Args:
+        blocks: Text of each <script type="application/ld+json"> element
+
+    Returns:
+        The Recipe, or None if no block holds a schema.org Recipe with both
+        ingredients and instructions
+    """
+    for block in blocks:
+        try:
+            node = _find_recipe(orjson.loads(block))
+        except orjson.JSONDecodeError:
+            continue
+        if node is None:
+            continue
+
+        ingredients = node.get("recipeIngredient") or node.get("ingredients") or []
+        if isinstance(ingredients, str):
+            ingredients = ingredients.splitlines()
+        ingredient_lines = [line for line in map(_text, ingredients) if line]
+        steps = list(_instruction_texts(node.get("recipeInstructions")))
+        title = _text(node.get("name"))
+        if not title or not ingredient_lines or not steps:
+            logger.info("schema.org Recipe is missing a title, ingredients, or instructions")
+            continue
+
+        nutrition = node.get("nutrition") if isinstance(node.get("nutrition"), dict) else {}
+        # Fractional yields such as "0.5" round up, since servings must be at least 1
+        servings = _first_number(node.get("recipeYield"))
+        calories = _first_number(nutrition.get("calories"))
+        try:
+            return Recipe.model_validate(
+                {
+                    "title": title,
+                    "description": _text(node.get("description")),
+                    "cuisine": ", ".join(_text_list(node.get("recipeCuisine"))),
+                    "servings": math.ceil(servings) if servings else None,
+                    "prep_time_minutes": _minutes(node.get("prepTime")),
+                    "cook_time_minutes": _minutes(node.get("cookTime")),
+                    "total_time_minutes": _minutes(node.get("totalTime")),
+                    "calories": round(calories) if calories is not None else None,
+                    "protein_grams": _first_number(nutrition.get("proteinContent")),
+                    "carbs_grams": _first_number(nutrition.get("carbohydrateContent")),
+                    "fat_grams": _first_number(nutrition.get("fatContent")),
+                    "dietary_tags": [_diet_tag(d) for d in _text_list(node.get("suitableForDiet"))],
+                    "keywords": _text_list(node.get("keywords")),
+                    "equipment": _text_list(node.get("tool")),
+                    "creator_name": _text(node.get("author")),
+                    "ingredients": [
+                        _parse_ingredient(line, idx)
+                        for idx, line in enumerate(ingredient_lines, start=1)
+                    ],
+                    "instructions": [
+                        {"step_number": idx, "text": text}
+                        for idx, text in enumerate(steps, start=1)
+                    ],
+                    "method_used": ExtractionMethod.WEBSITE,
+                }
+            )
+        except ValueError as e:
+            logger.warning(f"Invalid schema.org Recipe: {e}")
+    return None
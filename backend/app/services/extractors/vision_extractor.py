@@ -4,23 +4,48 @@ Uses GPT-4o to analyze video frames for text overlays
 and visual recipe content when metadata and audio fail.
 """
 
+import asyncio
 import base64
-import json
 import logging
-import re
-import subprocess
 import tempfile
 from pathlib import Path
 
-import yt_dlp
-from openai import OpenAI
+import orjson
+from openai import AsyncOpenAI
 
 from app.config import get_settings
-from app.schemas import ExtractionMethod, Ingredient, Instruction, Recipe
-from app.services.extractors.base import BaseExtractor, ExtractionResult, ProgressCallback
+from app.schemas import ExtractionMethod, Recipe
+from app.services.cache import content_cache_key, get_llm_response_cache
+from app.services.extractors.base import (
+    BaseExtractor,
+    ExtractionResult,
+    ProgressCallback,
+    get_scratch_dir,
+)
+from app.services.extractors.recipe_builder import recipe_from_cached_response
+from app.services.openai_clients import get_async_openai_client
 
 logger = logging.getLogger(__name__)
 
+# Model used to read recipes from video frames
+VISION_MODEL = "gpt-4o-mini"
+
+# Frames are sent with detail="low", which the API reduces to a single
+# 512x512 tile, so anything larger is wasted upload. Quality is on ffmpeg's
+# 2 (best) to 31 (worst) scale; 5 keeps on-screen text legible.
+FRAME_MAX_SIZE = 512
+FRAME_JPEG_QUALITY = "5"
+
+# Output budget for the recipe response. Most recipes fit well within the
+# first; a response cut off at that length is retried once with the second
+MAX_COMPLETION_TOKENS = 2048
+MAX_COMPLETION_TOKENS_RETRY = 4096
+
+# JPEG end-of-image marker, used to split ffmpeg's piped frame stream
+JPEG_EOI = b"\xff\xd9"
+
+# Static instructions sent as the system message. Kept byte-identical across
+# calls (no placeholders) so OpenAI's automatic prompt caching can reuse it.
 VISION_EXTRACTION_PROMPT = """You are a professional chef and recipe extraction expert analyzing video frames from a cooking video.
 
 Carefully examine each frame to extract a comprehensive recipe. Look for:
@@ -110,21 +135,17 @@ EXAMPLE OF A GOOD INSTRUCTION:
 """
 
 
-def _normalize_name(name: str) -> str:
-    """Convert ingredient name to normalized format."""
-    normalized = name.lower().strip()
-    normalized = re.sub(r"[^a-z0-9\s-]", "", normalized)
-    normalized = re.sub(r"\s+", "-", normalized)
-    return normalized
-
-
 class VisionExtractor(BaseExtractor):
     """Extracts recipe by analyzing video frames with GPT-4o."""
 
-    def __init__(self, progress_callback: ProgressCallback | None = None) -> None:
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        openai_client: AsyncOpenAI | None = None,
+    ) -> None:
         super().__init__(progress_callback)
         settings = get_settings()
-        self._openai = OpenAI(api_key=settings.openai_api_key)
+        self._openai = openai_client or get_async_openai_client()
         self._max_duration = settings.max_video_duration_seconds
 
     @property
@@ -136,18 +157,19 @@ class VisionExtractor(BaseExtractor):
         try:
             await self._report_progress("Downloading video...", 0.1)
 
-            video_path = await self._download_video(url)
-            if not video_path:
+            download = await self._download_video(url)
+            if not download:
                 return ExtractionResult(
                     success=False,
                     should_fallback=False,
                     error="Failed to download video",
                 )
+            video_path, duration = download
 
             try:
                 await self._report_progress("Extracting video frames...", 0.3)
 
-                frames = await self._extract_frames(video_path)
+                frames = await self._extract_frames(video_path, duration)
                 if not frames:
                     return ExtractionResult(
                         success=False,
@@ -181,181 +203,184 @@ class VisionExtractor(BaseExtractor):
                 error=str(e),
             )
 
-    async def _download_video(self, url: str) -> str | None:
-        """Download video using yt-dlp."""
-        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
+    async def _download_video(self, url: str) -> tuple[str, float] | None:
+        """Download video using yt-dlp.
+
+        Reuses the info dict cached by earlier tiers and checks the
+        duration limit before downloading anything.
+
+        Returns:
+            The downloaded file path and the video duration in seconds
+            (0 if unknown), or None if the download failed
+        """
+        with tempfile.NamedTemporaryFile(
+            suffix=".mp4", dir=get_scratch_dir(), delete=False
+        ) as tmp:
             output_path = tmp.name
 
         ydl_opts = {
-            "format": "worst[ext=mp4]/worst",
+            # Smallest mp4 that still has legible on-screen text; frames are
+            # scaled to 512px anyway, so anything larger is wasted download
+            # and decode. Very small streams tend to have sparse keyframes
+            "format": "worst[height>=240][height<=480][ext=mp4]/worst[ext=mp4]/worst",
+            # HLS/DASH videos download their fragments in parallel
+            "concurrent_fragment_downloads": 4,
             "outtmpl": output_path,
+            # The placeholder file above exists already; without this yt-dlp
+            # treats it as a finished download and leaves it empty
+            "overwrites": True,
             "quiet": True,
             "no_warnings": True,
         }
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
+            info = await self._extract_video_info(url, {"quiet": True, "no_warnings": True})
+            if not info:
+                return None
+
+            duration = info.get("duration") or 0
+            if duration > self._max_duration:
+                logger.warning(f"Video too long: {duration}s")
+                return None
 
-                duration = info.get("duration", 0)
-                if duration > self._max_duration:
-                    logger.warning(f"Video too long: {duration}s")
-                    return None
+            await self._download_from_info(info, ydl_opts)
 
             if Path(output_path).exists():
-                return output_path
-            return None
+                return output_path, duration
 
         except Exception as e:
             logger.warning(f"Video download failed: {e}")
-            return None
-
-    async def _extract_frames(self, video_path: str, num_frames: int = 6) -> list[bytes]:
-        """Extract evenly-spaced frames from video using ffmpeg."""
-        frames = []
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Get video duration first
-            probe_cmd = [
-                "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1", video_path
-            ]
-            try:
-                result = subprocess.run(probe_cmd, capture_output=True, text=True, check=True)
-                duration = float(result.stdout.strip())
-            except Exception:
-                duration = 60  # Default if probe fails
-
-            # Calculate frame interval
-            interval = max(1, int(duration / num_frames))
-
-            # Extract frames at intervals
-            cmd = [
-                "ffmpeg",
-                "-i", video_path,
-                "-vf", f"fps=1/{interval},scale=512:-1",
-                "-frames:v", str(num_frames),
-                f"{tmpdir}/frame_%03d.jpg",
-                "-y",
-                "-loglevel", "error",
-            ]
 
-            try:
-                subprocess.run(cmd, check=True, capture_output=True)
-            except subprocess.CalledProcessError as e:
-                logger.warning(f"ffmpeg frame extraction failed: {e}")
-                return []
-
-            for frame_path in sorted(Path(tmpdir).glob("frame_*.jpg")):
-                frames.append(frame_path.read_bytes())
-
-        logger.info("=== FRAMES EXTRACTED ===")
-        logger.info(f"Extracted {len(frames)} frames from video")
-        for i, frame in enumerate(frames):
-            logger.info(f"  Frame {i+1}: {len(frame)} bytes")
+        Path(output_path).unlink(missing_ok=True)
+        return None
+
+    async def _extract_frames(
+        self, video_path: str, duration: float, num_frames: int = 4
+    ) -> list[bytes]:
+        """Extract evenly-spaced frames from video using ffmpeg.
+
+        Only keyframes are decoded, which skips almost all decode work. The
+        first keyframe is kept, then the next keyframe at least
+        duration / num_frames seconds after the previous pick, so frames
+        still span the whole video. With an unknown duration the first
+        keyframes are used. Videos with too few keyframes are decoded in
+        full instead; that pass drops near-duplicate frames (static shots),
+        so fewer than num_frames may be returned.
+        """
+        interval = duration / num_frames if duration > 0 else 0
+        frames = await self._decode_frames(video_path, interval, num_frames, keyframes_only=True)
+        if len(frames) < num_frames // 2:
+            logger.info(f"Only {len(frames)} keyframes usable, decoding all frames")
+            frames = await self._decode_frames(
+                video_path, interval, num_frames, keyframes_only=False
+            ) or frames
+        if len(frames) < num_frames:
+            logger.info(f"Only {len(frames)} of {num_frames} frames were usable")
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("=== FRAMES EXTRACTED ===")
+            logger.info(f"Extracted {len(frames)} frames from video")
+            for i, frame in enumerate(frames):
+                logger.info(f"  Frame {i+1}: {len(frame)} bytes")
         return frames
 
+    async def _decode_frames(
+        self, video_path: str, interval: float, num_frames: int, keyframes_only: bool
+    ) -> list[bytes]:
+        """Run ffmpeg to pick frames at least `interval` seconds apart as JPEGs.
+
+        Frames are piped back on stdout as concatenated JPEGs rather than
+        written to and re-read from a temp directory. Only the full-decode
+        pass drops near-duplicates: the keyframe pass's frame count decides
+        whether to fall back, and static videos would otherwise always fall
+        back to the full decode.
+        """
+        # mpdecimate drops picks nearly identical to the previous one
+        decimate = "" if keyframes_only else ",mpdecimate"
+        cmd = ["ffmpeg"]
+        if keyframes_only:
+            cmd += ["-skip_frame", "nokey"]
+        cmd += [
+            "-i", video_path,
+            # Fit within the low-detail tile without upscaling, then convert
+            # straight to full-range 4:2:0, the JPEG encoder's native layout,
+            # so 4:4:4 or RGB sources don't produce larger 4:4:4 JPEGs
+            "-vf", (
+                f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{interval:.3f})',"
+                f"scale='min({FRAME_MAX_SIZE},iw)':'min({FRAME_MAX_SIZE},ih)'"
+                f":force_original_aspect_ratio=decrease,format=yuvj420p{decimate}"
+            ),
+            "-fps_mode", "vfr",
+            "-frames:v", str(num_frames),
+            "-f", "image2pipe",
+            "-c:v", "mjpeg",
+            "-q:v", FRAME_JPEG_QUALITY,
+            "pipe:1",
+            "-loglevel", "error",
+        ]
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await process.communicate()
+        except OSError as e:
+            logger.warning(f"ffmpeg frame extraction failed: {e}")
+            return []
+        if process.returncode != 0:
+            logger.warning(
+                f"ffmpeg frame extraction failed: {stderr.decode(errors='replace').strip()}"
+            )
+            return []
+
+        # JPEG byte-stuffs 0xFF inside image data, so the end-of-image marker
+        # only appears at frame boundaries
+        return [frame + JPEG_EOI for frame in stdout.split(JPEG_EOI) if frame]
+
     async def _analyze_with_gpt4o(self, frames: list[bytes]) -> Recipe | None:
         """Use GPT-4o to analyze frames for recipe content."""
-        # Build messages with images
-        content = [{"type": "text", "text": VISION_EXTRACTION_PROMPT}]
-
-        for frame_bytes in frames:
-            base64_image = base64.b64encode(frame_bytes).decode("utf-8")
-            content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{base64_image}",
-                    "detail": "low",
-                },
-            })
-
-        response = self._openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": content}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-            max_tokens=4096,
-        )
-
-        text = response.choices[0].message.content
-        if not text:
-            return None
-
-        data = json.loads(text)
-
-        logger.info("=== VISION LLM RESPONSE ===")
-        logger.info(f"has_recipe: {data.get('has_recipe')}")
-        logger.info(f"title: {data.get('title')}")
-        logger.info(f"ingredients count: {len(data.get('ingredients', []))}")
-        logger.info(f"instructions count: {len(data.get('instructions', []))}")
-
-        if not data.get("has_recipe"):
-            logger.info("LLM determined no recipe in video frames")
-            return None
-
-        # Validate we have actual recipe content
-        if not data.get("ingredients") or not data.get("instructions"):
-            logger.info("LLM returned has_recipe=true but missing ingredients or instructions")
-            return None
-
-        logger.info("=== EXTRACTED INGREDIENTS (from vision) ===")
-        for i, ing in enumerate(data.get("ingredients", [])[:5]):
-            logger.info(f"  {i+1}. {ing.get('raw_text', ing.get('name', 'unknown'))}")
-        if len(data.get("ingredients", [])) > 5:
-            logger.info(f"  ... and {len(data['ingredients']) - 5} more")
-
-        logger.info("=== EXTRACTED INSTRUCTIONS (from vision) ===")
-        for i, inst in enumerate(data.get("instructions", [])[:3]):
-            logger.info(f"  Step {inst.get('step_number', i+1)}: {inst.get('text', '')[:100]}...")
-        if len(data.get("instructions", [])) > 3:
-            logger.info(f"  ... and {len(data['instructions']) - 3} more steps")
-
-        ingredients = []
-        for idx, i in enumerate(data.get("ingredients", [])):
-            quantity = i.get("quantity")
-            ingredients.append(
-                Ingredient(
-                    raw_text=i.get("raw_text") or f"{quantity or ''} {i.get('unit', '')} {i.get('name', '')}".strip(),
-                    name=i.get("name") or "",
-                    normalized_name=i.get("normalized_name") or _normalize_name(i.get("name") or ""),
-                    quantity=float(quantity) if quantity is not None else 0.0,
-                    unit=i.get("unit") or "",
-                    preparation=i.get("preparation") or "",
-                    category=i.get("category") or "",
-                    optional=bool(i.get("optional")),
-                    sort_order=i.get("sort_order") or idx + 1,
+        # Identical frames yield an identical prompt, so reuse the response
+        llm_cache = get_llm_response_cache()
+        cache_key = content_cache_key(VISION_MODEL, VISION_EXTRACTION_PROMPT, *frames)
+        data = llm_cache.get(cache_key)
+        if data is not None:
+            logger.info("Using cached LLM response for video frames")
+        else:
+            # The static instructions go first as the system message so every
+            # call shares a cacheable prefix; the per-video frames follow
+            content = []
+            for frame_bytes in frames:
+                base64_image = base64.b64encode(frame_bytes).decode("utf-8")
+                content.append({
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{base64_image}",
+                        "detail": "low",
+                    },
+                })
+
+            for max_tokens in (MAX_COMPLETION_TOKENS, MAX_COMPLETION_TOKENS_RETRY):
+                response = await self._openai.chat.completions.create(
+                    model=VISION_MODEL,
+                    messages=[
+                        {"role": "system", "content": VISION_EXTRACTION_PROMPT},
+                        {"role": "user", "content": content},
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0.1,
+                    max_tokens=max_tokens,
                 )
-            )
+                if response.choices[0].finish_reason != "length":
+                    break
+                logger.info(f"Vision response truncated at {max_tokens} tokens")
 
-        instructions = []
-        for idx, inst in enumerate(data.get("instructions", [])):
-            instructions.append(
-                Instruction(
-                    step_number=inst.get("step_number", idx + 1),
-                    text=inst.get("text", ""),
-                    time_seconds=inst.get("time_seconds"),
-                    temperature=inst.get("temperature"),
-                    tip=inst.get("tip"),
-                )
-            )
+            text = response.choices[0].message.content
+            if not text:
+                return None
+
+            data = orjson.loads(text)
+            llm_cache.set(cache_key, data)
 
-        return Recipe(
-            title=data["title"],
-            description=data.get("description", ""),
-            cuisine=data.get("cuisine", ""),
-            difficulty=data.get("difficulty", ""),
-            servings=data.get("servings"),
-            prep_time_minutes=data.get("prep_time_minutes"),
-            cook_time_minutes=data.get("cook_time_minutes"),
-            total_time_minutes=data.get("total_time_minutes"),
-            calories=data.get("calories"),
-            protein_grams=data.get("protein_grams"),
-            carbs_grams=data.get("carbs_grams"),
-            fat_grams=data.get("fat_grams"),
-            dietary_tags=data.get("dietary_tags", []),
-            keywords=data.get("keywords", []),
-            equipment=data.get("equipment", []),
-            ingredients=ingredients,
-            instructions=instructions,
-            method_used=ExtractionMethod.VISION,
-        )
+        return recipe_from_cached_response(data, ExtractionMethod.VISION, llm_cache, cache_key)
@@ -1,22 +1,32 @@
 """Website tier extraction.
 
-Extracts recipes from recipe blogs and websites by fetching HTML,
-cleaning it, and using OpenAI to parse the recipe content.
+Extracts recipes from recipe blogs and websites by fetching HTML and
+reading its schema.org Recipe data, or, when there is none, cleaning it
+and using OpenAI to parse the recipe content.
 """
 
-import json
 import logging
 import re
 
 import httpx
-from openai import OpenAI
+import lxml.html
+import orjson
+from lxml import etree
+from openai import AsyncOpenAI
 
-from app.config import get_settings
-from app.schemas import ExtractionMethod, Ingredient, Instruction, Recipe
+from app.schemas import ExtractionMethod, Recipe
+from app.services.cache import content_cache_key, get_llm_response_cache
 from app.services.extractors.base import BaseExtractor, ExtractionResult, ProgressCallback
+from app.services.extractors.recipe_builder import recipe_from_cached_response
+from app.services.extractors.recipe_schema import RECIPE_RESPONSE_FORMAT
+from app.services.extractors.structured_data import recipe_from_json_ld
+from app.services.openai_clients import get_async_openai_client
 
 logger = logging.getLogger(__name__)
 
+# Model used to parse page content into a recipe
+RECIPE_MODEL = "gpt-4o-mini"
+
 WEBSITE_EXTRACTION_PROMPT = """You are a professional chef and recipe extraction expert. Analyze the following webpage content to extract a comprehensive, detailed recipe that a home cook could follow perfectly.
 
 WEBPAGE CONTENT:
@@ -98,122 +108,82 @@ EXAMPLE OF A GOOD INSTRUCTION:
 """
 
 
-def _normalize_name(name: str) -> str:
-    """Convert ingredient name to normalized format."""
-    normalized = name.lower().strip()
-    normalized = re.sub(r"[^a-z0-9\s-]", "", normalized)
-    normalized = re.sub(r"\s+", "-", normalized)
-    return normalized
+# Elements dropped together with their content before text is extracted
+NOISE_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside")
 
+# Div class words marking ad, sidebar, comment, and sharing blocks. Matched as
+# whole words so classes like "recipe-header" or "shadow" are kept
+_RE_NOISE_CLASS = re.compile(
+    r"(?<![a-z0-9])(?:ads?|advertisement|sidebar|comments?|social|share)(?![a-z0-9])",
+    re.IGNORECASE,
+)
 
-def _clean_html(html: str) -> str:
-    """Clean HTML content for LLM processing.
+# schema.org recipe data embedded for search engines
+JSON_LD_XPATH = '//script[@type="application/ld+json"]/text()'
 
-    Removes navigation, scripts, styles, ads, and other non-content elements.
-    Extracts main content from article or main tags when possible.
-    """
-    # Remove script and style tags with their content
-    html = re.sub(r"<script[^>]*>[\s\S]*?</script>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<style[^>]*>[\s\S]*?</style>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<noscript[^>]*>[\s\S]*?</noscript>", "", html, flags=re.IGNORECASE)
-
-    # Remove navigation, header, footer, aside elements
-    html = re.sub(r"<nav[^>]*>[\s\S]*?</nav>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<header[^>]*>[\s\S]*?</header>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<footer[^>]*>[\s\S]*?</footer>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<aside[^>]*>[\s\S]*?</aside>", "", html, flags=re.IGNORECASE)
-
-    # Remove comments
-    html = re.sub(r"<!--[\s\S]*?-->", "", html)
-
-    # Remove divs with ad/sidebar/comment classes
-    ad_patterns = [
-        r'<div[^>]*class="[^"]*(?:ad|advertisement|sidebar|comment|social|share)[^"]*"[^>]*>[\s\S]*?</div>',
-    ]
-    for pattern in ad_patterns:
-        html = re.sub(pattern, "", html, flags=re.IGNORECASE)
-
-    # Try to extract main/article content
-    main_match = re.search(r"<main[^>]*>([\s\S]*?)</main>", html, re.IGNORECASE)
-    if main_match:
-        html = main_match.group(1)
-    else:
-        article_match = re.search(r"<article[^>]*>([\s\S]*?)</article>", html, re.IGNORECASE)
-        if article_match:
-            html = article_match.group(1)
-
-    # Convert common block elements to newlines for readability
-    html = re.sub(r"<(?:p|div|br|li|h[1-6])[^>]*>", "\n", html, flags=re.IGNORECASE)
-    html = re.sub(r"</(?:p|div|li|h[1-6])>", "\n", html, flags=re.IGNORECASE)
-
-    # Remove remaining HTML tags
-    html = re.sub(r"<[^>]+>", " ", html)
-
-    # Decode HTML entities
-    html = html.replace("&nbsp;", " ")
-    html = html.replace("&amp;", "&")
-    html = html.replace("&lt;", "<")
-    html = html.replace("&gt;", ">")
-    html = html.replace("&quot;", '"')
-    html = html.replace("&#39;", "'")
-    html = html.replace("&rsquo;", "'")
-    html = html.replace("&lsquo;", "'")
-    html = html.replace("&rdquo;", '"')
-    html = html.replace("&ldquo;", '"')
-    html = html.replace("&mdash;", "—")
-    html = html.replace("&ndash;", "–")
-    html = html.replace("&deg;", "°")
-    html = html.replace("&frac12;", "½")
-    html = html.replace("&frac14;", "¼")
-    html = html.replace("&frac34;", "¾")
-
-    # Clean up whitespace
-    html = re.sub(r"\s+", " ", html)
-    html = re.sub(r"\n\s*\n", "\n\n", html)
-    html = html.strip()
-
-    return html
-
-
-def _extract_og_image(html: str) -> str | None:
-    """Extract og:image meta tag from HTML."""
-    # Try og:image first
-    match = re.search(
-        r'<meta[^>]*property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\']',
-        html,
-        re.IGNORECASE,
-    )
-    if match:
-        return match.group(1)
-
-    # Try reverse order (content before property)
-    match = re.search(
-        r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\']',
-        html,
-        re.IGNORECASE,
-    )
-    if match:
-        return match.group(1)
-
-    # Try twitter:image as fallback
-    match = re.search(
-        r'<meta[^>]*(?:name|property)=["\']twitter:image["\'][^>]*content=["\']([^"\']+)["\']',
-        html,
-        re.IGNORECASE,
-    )
-    if match:
-        return match.group(1)
+# Page content budget sent to the LLM, in tokens
+CONTENT_TOKENS = 4000
+# A token averages about four bytes of UTF-8. Budgeting in bytes rather than
+# characters keeps pages heavy in accents, CJK, or emoji within budget
+BYTES_PER_TOKEN = 4
+
+# Response body is fed to the parser in chunks of this many bytes
+FETCH_CHUNK_BYTES = 65536
+
+# Client error statuses that mean "try again later" rather than "no page here"
+TRANSIENT_STATUS_CODES = frozenset({408, 429})
 
+
+def _content_text(root: lxml.html.HtmlElement) -> str:
+    """Extract readable text from a parsed page, dropping non-content elements.
+
+    Prefers the main or article element when the page has one.
+    """
+    etree.strip_elements(root, *NOISE_TAGS, with_tail=False)
+    for div in root.xpath("//div[@class]"):
+        if _RE_NOISE_CLASS.search(div.get("class")):
+            div.drop_tree()
+
+    content = root.find(".//main")
+    if content is None:
+        content = root.find(".//article")
+    if content is None:
+        content = root
+
+    # Tags separate words, so text nodes are joined with a space before
+    # whitespace is collapsed
+    return " ".join(" ".join(content.itertext()).split())
+
+
+def _truncate_content(content: str) -> str:
+    """Trim page content to the token budget, cutting on a word boundary."""
+    max_bytes = CONTENT_TOKENS * BYTES_PER_TOKEN
+    encoded = content.encode()
+    if len(encoded) <= max_bytes:
+        return content
+    return encoded[:max_bytes].decode(errors="ignore").rsplit(" ", 1)[0]
+
+
+def _extract_og_image(root: lxml.html.HtmlElement) -> str | None:
+    """Extract the og:image URL from a parsed page, falling back to twitter:image."""
+    for prop in ("og:image", "twitter:image"):
+        for url in root.xpath("//meta[@property=$prop or @name=$prop]/@content", prop=prop):
+            if url.strip():
+                return url.strip()
     return None
 
 
 class WebsiteExtractor(BaseExtractor):
     """Extracts recipe from website HTML using OpenAI."""
 
-    def __init__(self, progress_callback: ProgressCallback | None = None) -> None:
-        super().__init__(progress_callback)
-        settings = get_settings()
-        self._openai = OpenAI(api_key=settings.openai_api_key)
+    def __init__(
+        self,
+        progress_callback: ProgressCallback | None = None,
+        openai_client: AsyncOpenAI | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        super().__init__(progress_callback, http_client)
+        self._openai = openai_client or get_async_openai_client()
 
     @property
     def tier_name(self) -> str:
@@ -224,17 +194,30 @@ class WebsiteExtractor(BaseExtractor):
         try:
             await self._report_progress("Fetching webpage...", 0.1)
 
-            html, og_image = await self._fetch_page(url)
-            if not html:
+            root = await self._fetch_page(url)
+            if root is None:
                 return ExtractionResult(
                     success=False,
                     should_fallback=False,
                     error="Failed to fetch webpage",
                 )
 
-            await self._report_progress("Cleaning HTML content...", 0.3)
+            og_image = _extract_og_image(root)
+            if og_image:
+                logger.info(f"Found og:image: {og_image}")
 
-            cleaned_content = _clean_html(html)
+            # Structured recipe data needs no LLM; it's read before the
+            # cleaner strips script elements. lxml returns str subclasses,
+            # which orjson rejects
+            recipe = recipe_from_json_ld(map(str, root.xpath(JSON_LD_XPATH)))
+            if recipe:
+                logger.info(f"Using schema.org recipe data from {url}")
+                await self._report_progress("Recipe extracted successfully", 1.0)
+                recipe.source_url = url
+                recipe.thumbnail_url = og_image
+                return ExtractionResult(success=True, recipe=recipe)
+
+            cleaned_content = _content_text(root)
             logger.info(f"Cleaned content length: {len(cleaned_content)} characters")
             logger.info(f"Cleaned content preview: {cleaned_content[:500]}...")
 
@@ -264,19 +247,37 @@ class WebsiteExtractor(BaseExtractor):
 
             return ExtractionResult(success=True, recipe=recipe)
 
+        except httpx.HTTPError as e:
+            logger.warning(f"Failed to fetch webpage {url}: {type(e).__name__}: {e}")
+            return ExtractionResult(
+                success=False,
+                should_fallback=False,
+                error=f"Failed to fetch webpage: {e}",
+                transient=True,
+            )
         except Exception as e:
+            # LLM rate limits, timeouts and the like, which a retry may not hit
             logger.exception(f"Website extraction failed for {url}")
             return ExtractionResult(
                 success=False,
                 should_fallback=False,
                 error=str(e),
+                transient=True,
             )
 
-    async def _fetch_page(self, url: str) -> tuple[str | None, str | None]:
-        """Fetch webpage HTML and extract og:image.
+    async def _fetch_page(self, url: str) -> lxml.html.HtmlElement | None:
+        """Fetch and parse a webpage.
+
+        The body is fed to lxml as it arrives, so parsing overlaps the
+        download and the raw HTML is never held as one string.
 
         Returns:
-            Tuple of (html_content, og_image_url)
+            The parsed document, or None if the site refused the page (a 4xx
+            other than 408/429) or it couldn't be parsed
+
+        Raises:
+            httpx.HTTPError: On network errors, timeouts, rate limits and
+                server errors, which may not repeat on retry
         """
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -289,131 +290,71 @@ class WebsiteExtractor(BaseExtractor):
         }
 
         try:
-            async with httpx.AsyncClient(
+            async with self._http.stream(
+                "GET",
+                url,
+                headers=headers,
                 timeout=30.0,
                 follow_redirects=True,
-                headers=headers,
-            ) as client:
-                response = await client.get(url)
+            ) as response:
                 logger.info(f"HTTP Status: {response.status_code}")
                 response.raise_for_status()
-                html = response.text
+
+                # Decode like response.text did: the Content-Type charset,
+                # else UTF-8
+                parser = lxml.html.HTMLParser(
+                    encoding=response.charset_encoding or "utf-8",
+                    remove_comments=True,
+                    remove_pis=True,
+                )
+                async for chunk in response.aiter_bytes(FETCH_CHUNK_BYTES):
+                    parser.feed(chunk)
+                root = parser.close()
 
             logger.info("=== WEBPAGE FETCHED ===")
             logger.info(f"URL: {url}")
-            logger.info(f"Content length: {len(html)} characters")
-            logger.info(f"HTML preview: {html[:500]}...")
+            logger.info(f"Downloaded: {response.num_bytes_downloaded} bytes")
 
-            og_image = _extract_og_image(html)
-            if og_image:
-                logger.info(f"Found og:image: {og_image}")
-
-            return html, og_image
+            return root
 
         except httpx.HTTPStatusError as e:
+            if e.response.status_code in TRANSIENT_STATUS_CODES or e.response.is_server_error:
+                raise
             logger.warning(f"HTTP error fetching webpage: {e.response.status_code} - {e}")
-            return None, None
-        except httpx.RequestError as e:
-            logger.warning(f"Request error fetching webpage: {e}")
-            return None, None
+            return None
+        except httpx.RequestError:
+            # Network errors and timeouts, also retryable
+            raise
         except Exception as e:
             logger.warning(f"Failed to fetch webpage: {type(e).__name__}: {e}")
-            return None, None
+            return None
 
     async def _parse_with_openai(self, content: str) -> Recipe | None:
         """Use OpenAI to parse webpage content into structured recipe."""
-        # Limit content length for LLM context
-        content_limited = content[:15000]
-
-        prompt = WEBSITE_EXTRACTION_PROMPT.format(content=content_limited)
-
-        response = self._openai.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
-
-        result = response.choices[0].message.content
-        if not result:
-            return None
-
-        data = json.loads(result)
-
-        logger.info("=== WEBSITE LLM RESPONSE ===")
-        logger.info(f"Raw response: {result[:500]}...")
-        logger.info(f"has_recipe: {data.get('has_recipe')}")
-        logger.info(f"title: {data.get('title')}")
-        logger.info(f"ingredients count: {len(data.get('ingredients', []))}")
-        logger.info(f"instructions count: {len(data.get('instructions', []))}")
-
-        if not data.get("has_recipe"):
-            logger.info("LLM determined no recipe on webpage")
-            return None
-
-        # Validate we have actual recipe content
-        if not data.get("ingredients") or not data.get("instructions"):
-            logger.info(f"LLM returned has_recipe=true but missing content. ingredients={len(data.get('ingredients', []))}, instructions={len(data.get('instructions', []))}")
-            return None
-
-        logger.info("=== EXTRACTED INGREDIENTS (from website) ===")
-        for i, ing in enumerate(data.get("ingredients", [])[:5]):
-            logger.info(f"  {i+1}. {ing.get('raw_text', ing.get('name', 'unknown'))}")
-        if len(data.get("ingredients", [])) > 5:
-            logger.info(f"  ... and {len(data['ingredients']) - 5} more")
-
-        logger.info("=== EXTRACTED INSTRUCTIONS (from website) ===")
-        for i, inst in enumerate(data.get("instructions", [])[:3]):
-            logger.info(f"  Step {inst.get('step_number', i+1)}: {inst.get('text', '')[:100]}...")
-        if len(data.get("instructions", [])) > 3:
-            logger.info(f"  ... and {len(data['instructions']) - 3} more steps")
-
-        ingredients = []
-        for idx, i in enumerate(data.get("ingredients", [])):
-            quantity = i.get("quantity")
-            ingredients.append(
-                Ingredient(
-                    raw_text=i.get("raw_text") or f"{quantity or ''} {i.get('unit', '')} {i.get('name', '')}".strip(),
-                    name=i.get("name") or "",
-                    normalized_name=i.get("normalized_name") or _normalize_name(i.get("name") or ""),
-                    quantity=float(quantity) if quantity is not None else 0.0,
-                    unit=i.get("unit") or "",
-                    preparation=i.get("preparation") or "",
-                    category=i.get("category") or "",
-                    optional=bool(i.get("optional")),
-                    sort_order=i.get("sort_order") or idx + 1,
-                )
+        content_limited = _truncate_content(content)
+
+        # Identical page content yields an identical prompt, so reuse the response
+        llm_cache = get_llm_response_cache()
+        cache_key = content_cache_key(RECIPE_MODEL, WEBSITE_EXTRACTION_PROMPT, content_limited)
+        data = llm_cache.get(cache_key)
+        if data is not None:
+            logger.info("Using cached LLM response for webpage")
+        else:
+            prompt = WEBSITE_EXTRACTION_PROMPT.format(content=content_limited)
+
+            response = await self._openai.chat.completions.create(
+                model=RECIPE_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                response_format=RECIPE_RESPONSE_FORMAT,
+                temperature=0.1,
             )
 
-        instructions = []
-        for idx, inst in enumerate(data.get("instructions", [])):
-            instructions.append(
-                Instruction(
-                    step_number=inst.get("step_number", idx + 1),
-                    text=inst.get("text", ""),
-                    time_seconds=inst.get("time_seconds"),
-                    temperature=inst.get("temperature"),
-                    tip=inst.get("tip"),
-                )
-            )
+            result = response.choices[0].message.content
+            if not result:
+                return None
+
+            data = orjson.loads(result)
+            llm_cache.set(cache_key, data)
+            logger.info(f"Raw response: {result[:500]}...")
 
-        return Recipe(
-            title=data["title"],
-            description=data.get("description", ""),
-            cuisine=data.get("cuisine", ""),
-            difficulty=data.get("difficulty", ""),
-            servings=data.get("servings"),
-            prep_time_minutes=data.get("prep_time_minutes"),
-            cook_time_minutes=data.get("cook_time_minutes"),
-            total_time_minutes=data.get("total_time_minutes"),
-            calories=data.get("calories"),
-            protein_grams=data.get("protein_grams"),
-            carbs_grams=data.get("carbs_grams"),
-            fat_grams=data.get("fat_grams"),
-            dietary_tags=data.get("dietary_tags", []),
-            keywords=data.get("keywords", []),
-            equipment=data.get("equipment", []),
-            ingredients=ingredients,
-            instructions=instructions,
-            method_used=ExtractionMethod.WEBSITE,
-        )
+        return recipe_from_cached_response(data, ExtractionMethod.WEBSITE, llm_cache, cache_key)
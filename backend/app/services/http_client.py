@@ -0,0 +1,19 @@
+"""Process-wide HTTP client.
+
+Sharing one client keeps keep-alive connections (and HTTP/2 sessions) to
+caption CDNs and recipe sites open across extractions instead of paying
+a new TCP + TLS handshake per fetch.
+"""
+
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    )
@@ -0,0 +1,18 @@
+"""Process-wide OpenAI client.
+
+The client owns an HTTP connection pool, so sharing one instance keeps
+connections to the API warm across extractions instead of paying a new
+TCP + TLS handshake per extractor.
+"""
+
+from functools import lru_cache
+
+from openai import AsyncOpenAI
+
+from app.config import get_settings
+
+
+@lru_cache
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get the shared async OpenAI client."""
+    return AsyncOpenAI(api_key=get_settings().openai_api_key)
@@ -8,16 +8,30 @@ import asyncio
 import hashlib
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 
 import httpx
+import orjson
 
 from app.schemas import Recipe
+from app.services.cache import cache_key, get_failed_extraction_cache
 from app.services.extractors.website_extractor import WebsiteExtractor
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 THEMEALDB_BASE_URL = "https://www.themealdb.com/api/json/v1/1"
 
+# TheMealDB categories ruled out by each dietary restriction
+_MEAT_CATEGORIES = frozenset({"beef", "chicken", "lamb", "pork", "goat", "seafood"})
+EXCLUDED_CATEGORIES = {
+    "vegetarian": _MEAT_CATEGORIES,
+    "vegan": _MEAT_CATEGORIES | {"dessert"},
+}
+
+# Upper bound on random-meal requests in flight at once
+MEAL_FETCH_BATCH_SIZE = 20
+
 
 @dataclass
 class TheMealDBMeal:
@@ -141,34 +155,49 @@ def _recipe_to_populated(recipe: Recipe, source_url: str, image_url: str | None,
     )
 
 
-def _matches_dietary_restrictions(category: str, restrictions: list[str] | None) -> bool:
-    """Check if meal category matches dietary restrictions."""
+@lru_cache(maxsize=1024)
+def _matches_dietary_restrictions(category: str, restrictions: tuple[str, ...]) -> bool:
+    """Check if meal category matches dietary restrictions.
+
+    Args:
+        category: TheMealDB category, e.g. "Beef" or "Vegetarian"
+        restrictions: Lowercased dietary restrictions
+    """
     if not restrictions:
         return True
 
-    category_lower = category.lower()
-
+    category_words = category.lower().split()
     for restriction in restrictions:
-        r = restriction.lower()
+        excluded = EXCLUDED_CATEGORIES.get(restriction)
+        if excluded and not excluded.isdisjoint(category_words):
+            return False
 
-        if r == "vegetarian":
-            meat_categories = ["beef", "chicken", "lamb", "pork", "goat", "seafood"]
-            if any(c in category_lower for c in meat_categories):
-                return False
+    return True
 
-        if r == "vegan":
-            non_vegan_categories = ["beef", "chicken", "lamb", "pork", "goat", "seafood", "dessert"]
-            if any(c in category_lower for c in non_vegan_categories):
-                return False
 
-    return True
+def _has_excluded_ingredient(recipe: PopulatedRecipe, exclusions: frozenset[str]) -> bool:
+    """Check if any ingredient name contains one of the lowercased exclusions.
+
+    Stops at the first match.
+    """
+    for ing in recipe.ingredients:
+        name = ing.get("name", "").lower()
+        if any(ex in name for ex in exclusions):
+            return True
+    return False
 
 
 class RecipePopulator:
     """Service for populating discover recipes from TheMealDB."""
 
-    def __init__(self) -> None:
-        self._extractor = WebsiteExtractor()
+    def __init__(self, http_client: httpx.AsyncClient | None = None) -> None:
+        """Initialize the populator.
+
+        Args:
+            http_client: HTTP client to use; defaults to the process-wide client
+        """
+        self._http = http_client or get_http_client()
+        self._extractor = WebsiteExtractor(http_client=self._http)
 
     async def fetch_random_meal(self) -> TheMealDBMeal | None:
         """Fetch a single random meal from TheMealDB.
@@ -178,32 +207,31 @@ class RecipePopulator:
         """
         url = f"{THEMEALDB_BASE_URL}/random.php"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-
-                meals = data.get("meals", [])
-                if not meals:
-                    return None
-
-                meal = meals[0]
-                source_url = meal.get("strSource") or f"https://www.themealdb.com/meal/{meal['idMeal']}"
-
-                return TheMealDBMeal(
-                    id=meal["idMeal"],
-                    title=meal["strMeal"],
-                    source_url=source_url,
-                    image=meal.get("strMealThumb", ""),
-                    category=meal.get("strCategory", ""),
-                    area=meal.get("strArea", ""),
-                )
-
-            except Exception as e:
-                logger.error(f"Error fetching random meal: {e}")
+        try:
+            response = await self._http.get(url, timeout=30.0)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            meals = data.get("meals", [])
+            if not meals:
                 return None
 
+            meal = meals[0]
+            source_url = meal.get("strSource") or f"https://www.themealdb.com/meal/{meal['idMeal']}"
+
+            return TheMealDBMeal(
+                id=meal["idMeal"],
+                title=meal["strMeal"],
+                source_url=source_url,
+                image=meal.get("strMealThumb", ""),
+                category=meal.get("strCategory", ""),
+                area=meal.get("strArea", ""),
+            )
+
+        except Exception as e:
+            logger.error(f"Error fetching random meal: {e}")
+            return None
+
     async def fetch_themealdb_recipes(
         self,
         count: int = 10,
@@ -213,7 +241,8 @@ class RecipePopulator:
         """Fetch random recipes from TheMealDB API.
 
         Note: TheMealDB only returns 1 random meal at a time, so we make
-        multiple requests to get the desired count.
+        multiple requests to get the desired count. They are issued
+        concurrently in batches sized to what is still missing.
 
         Args:
             count: Number of recipes to fetch
@@ -226,28 +255,36 @@ class RecipePopulator:
         recipes: list[TheMealDBMeal] = []
         seen_ids: set[str] = set()
         max_attempts = count * 5  # Limit API calls
+        attempts = 0
+        restrictions = tuple(r.lower() for r in dietary_restrictions or ())
 
-        for _ in range(max_attempts):
-            if len(recipes) >= count:
-                break
+        while len(recipes) < count and attempts < max_attempts:
+            # Over-fetch to allow for duplicates and filtered meals
+            batch_size = min(
+                (count - len(recipes)) * 2, max_attempts - attempts, MEAL_FETCH_BATCH_SIZE
+            )
+            attempts += batch_size
+            batch = await asyncio.gather(*(self.fetch_random_meal() for _ in range(batch_size)))
 
-            meal = await self.fetch_random_meal()
-            if not meal:
-                continue
+            for meal in batch:
+                if not meal:
+                    continue
 
-            # Skip duplicates
-            if meal.id in seen_ids:
-                continue
-            seen_ids.add(meal.id)
+                # Skip duplicates
+                if meal.id in seen_ids:
+                    continue
+                seen_ids.add(meal.id)
 
-            # Apply dietary restrictions filter
-            if not _matches_dietary_restrictions(meal.category, dietary_restrictions):
-                continue
+                # Apply dietary restrictions filter
+                if not _matches_dietary_restrictions(meal.category, restrictions):
+                    continue
 
-            # Apply ingredient exclusion filter (basic check - full check done during enrichment)
-            # TheMealDB random endpoint doesn't include ingredients in the response
+                # Apply ingredient exclusion filter (basic check - full check done during enrichment)
+                # TheMealDB random endpoint doesn't include ingredients in the response
 
-            recipes.append(meal)
+                recipes.append(meal)
+                if len(recipes) >= count:
+                    break
 
         logger.info(f"Fetched {len(recipes)} recipes from TheMealDB")
         return recipes
@@ -261,6 +298,13 @@ class RecipePopulator:
         Returns:
             Fully enriched PopulatedRecipe or None if extraction fails
         """
+        failed_cache = get_failed_extraction_cache()
+        key = cache_key(meal.source_url)
+        error = failed_cache.get(key)
+        if error is not None:
+            logger.info(f"Skipping {meal.source_url}, extraction failed recently: {error}")
+            return None
+
         logger.info(f"Enriching recipe: {meal.title} from {meal.source_url}")
 
         try:
@@ -268,6 +312,10 @@ class RecipePopulator:
 
             if not result.success or not result.recipe:
                 logger.warning(f"Failed to extract recipe from {meal.source_url}: {result.error}")
+                # Only remember failures that would repeat; rate limits and
+                # network errors shouldn't block the page for the whole TTL
+                if not result.transient:
+                    failed_cache.set(key, result.error or "unknown error")
                 return None
 
             populated = _recipe_to_populated(
@@ -289,7 +337,7 @@ class RecipePopulator:
         count: int = 10,
         dietary_restrictions: list[str] | None = None,
         exclude_ingredients: list[str] | None = None,
-        max_concurrent: int = 3,
+        max_concurrent: int = 8,
     ) -> list[PopulatedRecipe]:
         """Fetch and enrich recipes from TheMealDB.
 
@@ -322,28 +370,33 @@ class RecipePopulator:
                 return await self.enrich_recipe(meal)
 
         # Create tasks for all meals
-        tasks = [process_with_semaphore(m) for m in meals]
+        tasks = [asyncio.create_task(process_with_semaphore(m)) for m in meals]
+
+        # Take results as they finish; once enough succeed, the remaining
+        # enrichments (and their fetches and LLM calls) are cancelled
+        exclusions = frozenset(ex.lower() for ex in exclude_ingredients or ())
+        populated_recipes: list[PopulatedRecipe] = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                try:
+                    result = await next_result
+                except Exception as e:
+                    logger.error(f"Recipe enrichment error: {e}")
+                    continue
 
-        # Wait for results
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+                if result is None:
+                    continue
 
-        # Filter successful results
-        populated_recipes = []
-        for result in results:
-            if isinstance(result, PopulatedRecipe):
                 # Apply ingredient exclusion filter on enriched recipe
-                if exclude_ingredients:
-                    ingredients_text = " ".join(
-                        ing.get("name", "").lower() for ing in result.ingredients
-                    )
-                    if any(ex.lower() in ingredients_text for ex in exclude_ingredients):
-                        continue
+                if exclusions and _has_excluded_ingredient(result, exclusions):
+                    continue
 
                 populated_recipes.append(result)
                 if len(populated_recipes) >= count:
                     break
-            elif isinstance(result, Exception):
-                logger.error(f"Recipe enrichment error: {result}")
+        finally:
+            for task in tasks:
+                task.cancel()
 
         logger.info(f"Successfully populated {len(populated_recipes)} recipes")
         return populated_recipes
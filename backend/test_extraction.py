@@ -2,7 +2,10 @@
 """Quick test script for the extraction pipeline."""
 
 import asyncio
+import sys
+
 import httpx
+import orjson
 
 API_BASE = "http://localhost:8000"
 
@@ -12,104 +15,244 @@ TEST_URLS = {
     "website": "https://www.seriouseats.com/easy-pan-fried-pork-chops-recipe",
 }
 
+# URLs tested by main(); the website is fastest (no video download)
+RUN_URLS = [
+    TEST_URLS["website"],
+    # TEST_URLS["youtube"],  # Uncomment to test video extraction (slower)
+]
 
-async def test_post_endpoint(url: str) -> None:
-    """Test the regular POST endpoint."""
-    print(f"\n{'='*60}")
-    print(f"Testing POST /api/v1/extract")
-    print(f"URL: {url}")
-    print("="*60)
+# URLs tested at once
+MAX_CONCURRENT_URLS = 8
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.post(
-            f"{API_BASE}/api/v1/extract",
-            json={"url": url},
-        )
+# Seconds to wait for queued output to be written before giving up on it
+DRAIN_TIMEOUT = 5.0
+
+# Bytes of an error response body shown, enough for a traceback summary
+ERROR_BODY_BYTES = 2048
+
+# SSE framing, matched on raw bytes
+FRAME_END = b"\n\n"
+EVENT_FIELD = b"event"
+DATA_FIELD = b"data"
+
+
+class SSEFrame:
+    """Event assembled from the lines of one SSE frame.
+
+    A single instance is reused for the whole stream and reset in place at
+    each frame boundary.
+    """
+
+    __slots__ = ("event_type", "data_parts")
+
+    def __init__(self) -> None:
+        self.event_type: str | None = None
+        self.data_parts: list[bytes] = []
+
+    def reset(self) -> None:
+        """Clear the frame for the next event."""
+        self.event_type = None
+        self.data_parts.clear()
+
+
+def header(title: str, url: str) -> list[str]:
+    """Format the banner printed above a test's output."""
+    return [f"\n{'='*60}", title, f"URL: {url}", "="*60]
+
+
+async def test_post_endpoint(
+    client: httpx.AsyncClient, url: str, output: asyncio.Queue[str | None]
+) -> None:
+    """Test the regular POST endpoint.
+
+    Output is collected and queued as one block when the test finishes, so
+    tests running concurrently don't interleave their lines.
+    """
+    out = header("Testing POST /api/v1/extract", url)
+
+    try:
+        response = await client.post("/api/v1/extract", json={"url": url})
 
         if response.status_code == 200:
             data = response.json()
             if data.get("success"):
                 recipe = data["recipe"]
-                print(f"✅ Success! Method: {data['method_used']}")
-                print(f"   Title: {recipe['title']}")
-                print(f"   Cuisine: {recipe.get('cuisine', 'N/A')}")
-                print(f"   Ingredients: {len(recipe['ingredients'])}")
-                print(f"   Instructions: {len(recipe['instructions'])}")
-                print(f"   Thumbnail: {recipe.get('thumbnail_url', 'N/A')[:50]}...")
+                out.append(f"✅ Success! Method: {data['method_used']}")
+                out.append(f"   Title: {recipe['title']}")
+                out.append(f"   Cuisine: {recipe.get('cuisine', 'N/A')}")
+                out.append(f"   Ingredients: {len(recipe['ingredients'])}")
+                out.append(f"   Instructions: {len(recipe['instructions'])}")
+                out.append(f"   Thumbnail: {recipe.get('thumbnail_url', 'N/A')[:50]}...")
             else:
-                print(f"❌ Failed: {data.get('error')}")
+                out.append(f"❌ Failed: {data.get('error')}")
         else:
-            print(f"❌ HTTP Error: {response.status_code}")
-            print(response.text)
-
-
-async def test_sse_endpoint(url: str) -> None:
-    """Test the SSE streaming endpoint."""
-    print(f"\n{'='*60}")
-    print(f"Testing GET /api/v1/extract/stream (SSE)")
-    print(f"URL: {url}")
-    print("="*60)
-
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        async with client.stream(
-            "GET",
-            f"{API_BASE}/api/v1/extract/stream",
-            params={"url": url},
-        ) as response:
-            async for line in response.aiter_lines():
-                if line.startswith("event:"):
-                    event_type = line.split(":", 1)[1].strip()
-                elif line.startswith("data:"):
-                    import json
-                    data = json.loads(line.split(":", 1)[1].strip())
-
-                    if event_type == "progress":
-                        percent = int(data["percent"] * 100)
-                        tier = data.get("tier") or "..."
-                        print(f"   [{percent:3d}%] [{tier}] {data['message']}")
-
-                    elif event_type == "complete":
-                        recipe = data["recipe"]
-                        print(f"\n✅ Complete!")
-                        print(f"   Title: {recipe['title']}")
-                        print(f"   Cuisine: {recipe.get('cuisine', 'N/A')}")
-                        print(f"   Ingredients: {len(recipe['ingredients'])}")
-                        print(f"   Instructions: {len(recipe['instructions'])}")
-
-                    elif event_type == "error":
-                        print(f"\n❌ Error: {data['message']}")
-
-
-async def test_health() -> None:
+            out.append(f"❌ HTTP Error: {response.status_code}")
+            out.append(response.content[:ERROR_BODY_BYTES].decode("utf-8", errors="replace"))
+    finally:
+        output.put_nowait("\n".join(out))
+
+
+def format_event(event_type: str | None, data: dict) -> list[str]:
+    """Format a decoded SSE event as output lines."""
+    if event_type == "progress":
+        percent = int(data["percent"] * 100)
+        tier = data.get("tier") or "..."
+        return [f"   [{percent:3d}%] [{tier}] {data['message']}"]
+
+    if event_type == "complete":
+        recipe = data["recipe"]
+        return [
+            "\n✅ Complete!",
+            f"   Title: {recipe['title']}",
+            f"   Cuisine: {recipe.get('cuisine', 'N/A')}",
+            f"   Ingredients: {len(recipe['ingredients'])}",
+            f"   Instructions: {len(recipe['instructions'])}",
+        ]
+
+    if event_type == "error":
+        return [f"\n❌ Error: {data['message']}"]
+
+    return []
+
+
+async def test_sse_endpoint(
+    client: httpx.AsyncClient, url: str, output: asyncio.Queue[str | None]
+) -> None:
+    """Test the SSE streaming endpoint.
+
+    Frames are split on their blank-line terminator and fields are matched
+    on the raw bytes; only the data value is decoded. Each chunk is scanned
+    once, so a large event arriving in many chunks is parsed in linear time.
+    Each event's output is queued as soon as it is parsed.
+    """
+    output.put_nowait("\n".join(header("Testing GET /api/v1/extract/stream (SSE)", url)))
+
+    async with client.stream(
+        "GET",
+        "/api/v1/extract/stream",
+        params={"url": url},
+    ) as response:
+        event = SSEFrame()
+        buf = bytearray()
+        async for chunk in response.aiter_bytes():
+            # Only the new bytes, plus the last old one in case a
+            # terminator straddles chunks, can complete a frame
+            start = max(len(buf) - 1, 0)
+            buf.extend(chunk)
+            pos = 0
+            # Frames are copied out of the buffer once, through a view
+            with memoryview(buf) as view:
+                while (end := buf.find(FRAME_END, max(pos, start))) != -1:
+                    frame = bytes(view[pos:end])
+                    pos = end + len(FRAME_END)
+                    for line in frame.split(b"\n"):
+                        # Comments, such as the backend's ": ping" keep-alives
+                        if not line or line.startswith(b":"):
+                            continue
+                        field, sep, value = line.partition(b":")
+                        if not sep:
+                            continue
+                        # Per the SSE spec, one leading space is dropped
+                        if value.startswith(b" "):
+                            value = value[1:]
+                        if field == EVENT_FIELD:
+                            event.event_type = value.decode()
+                        elif field == DATA_FIELD:
+                            event.data_parts.append(value)
+
+                    # Multiple data lines form one payload, joined by newlines
+                    if event.data_parts:
+                        data = orjson.loads(b"\n".join(event.data_parts))
+                        if lines := format_event(event.event_type, data):
+                            output.put_nowait("\n".join(lines))
+                    event.reset()
+            # Consumed frames are dropped once per chunk; the buffer's
+            # storage is kept and reused for the next chunk
+            del buf[:pos]
+
+
+async def test_health(client: httpx.AsyncClient) -> None:
     """Test health endpoint."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{API_BASE}/api/v1/health")
-        if response.status_code == 200:
-            print("✅ Backend is healthy")
-        else:
-            print("❌ Backend is not responding")
-            exit(1)
+    response = await client.get("/api/v1/health")
+    if response.status_code == 200:
+        print("✅ Backend is healthy")
+    else:
+        print("❌ Backend is not responding")
+        exit(1)
 
 
-async def main() -> None:
-    print("\n🧪 Recipe Extraction Pipeline Test\n")
+async def run_url(
+    client: httpx.AsyncClient,
+    url: str,
+    output: asyncio.Queue[str | None],
+    semaphore: asyncio.Semaphore,
+) -> str:
+    """Run the POST and SSE tests for one URL concurrently.
+
+    Returns:
+        The URL, so callers can report it as it finishes
+    """
+    async with semaphore:
+        await asyncio.gather(
+            test_post_endpoint(client, url, output),
+            test_sse_endpoint(client, url, output),
+        )
+    return url
+
 
-    # Check health first
-    await test_health()
+async def drain(output: asyncio.Queue[str | None]) -> None:
+    """Write queued output to stdout until None is queued.
 
-    # Test with a website URL (faster, no video download)
-    print("\n📄 Testing Website Extraction...")
-    await test_post_endpoint(TEST_URLS["website"])
+    Flushes whenever the queue runs empty, so bursts of progress events
+    are written together.
+    """
+    try:
+        while (text := await output.get()) is not None:
+            sys.stdout.write(text + "\n")
+            if output.empty():
+                sys.stdout.flush()
+    finally:
+        sys.stdout.flush()
+
+
+async def main() -> None:
+    print("\n🧪 Recipe Extraction Pipeline Test\n")
 
-    print("\n📄 Testing Website with SSE...")
-    await test_sse_endpoint(TEST_URLS["website"])
+    # One client for every test, so connections to the backend are reused
+    async with httpx.AsyncClient(
+        base_url=API_BASE,
+        timeout=120.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    ) as client:
+        # Check health first
+        await test_health(client)
 
-    # Uncomment to test video extraction (slower)
-    # print("\n🎬 Testing Video Extraction...")
-    # await test_post_endpoint(TEST_URLS["youtube"])
-    #
-    # print("\n🎬 Testing Video with SSE...")
-    # await test_sse_endpoint(TEST_URLS["youtube"])
+        # The tests are independent, so they run concurrently and the total
+        # time is that of the slowest one
+        print(f"\n📄 Testing {len(RUN_URLS)} URL(s) (POST and SSE)...")
+        # Tests queue their output and a single task writes it, so parsing
+        # never waits on the terminal
+        output: asyncio.Queue[str | None] = asyncio.Queue()
+        printer = asyncio.create_task(drain(output))
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_URLS)
+        tasks = [
+            asyncio.create_task(run_url(client, url, output, semaphore)) for url in RUN_URLS
+        ]
+        try:
+            # Each URL is reported as soon as its tests finish
+            for next_done in asyncio.as_completed(tasks):
+                output.put_nowait(f"\n🏁 Finished {await next_done}")
+        finally:
+            # Stop any unfinished tests (on error) and let them queue their
+            # last output before the printer is told to stop
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            output.put_nowait(None)
+            # The printer exits once everything queued is written; it is
+            # only cancelled if that takes too long
+            await asyncio.wait_for(printer, DRAIN_TIMEOUT)
 
 
 if __name__ == "__main__":
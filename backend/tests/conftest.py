@@ -0,0 +1,6 @@
+"""Shared test setup."""
+
+import os
+
+# Settings requires an API key; tests never call OpenAI
+os.environ.setdefault("OPENAI_API_KEY", "test")
@@ -0,0 +1,18 @@
+"""Tests for choosing transcription chunk cuts in app.services.extractors.audio_extractor."""
+
+from app.services.extractors.audio_extractor import _chunk_cut_points
+
+
+def test_chunk_cut_points_short_audio_is_not_split() -> None:
+    assert _chunk_cut_points([(10.0, 10.5)], 45.0) == []
+
+
+def test_chunk_cut_points_cut_in_last_pause_before_limit() -> None:
+    pauses = [(7.0 * k, 7.0 * k + 0.5) for k in range(1, 19)]
+
+    assert _chunk_cut_points(pauses, 130.0) == [42.25, 84.25, 126.25]
+
+
+def test_chunk_cut_points_without_nearby_pause_cut_at_limit() -> None:
+    # The only pause is too early to end the first chunk near its limit
+    assert _chunk_cut_points([(5.0, 5.5)], 100.0) == [45.0, 90.0]
@@ -0,0 +1,48 @@
+"""Tests for the failed-extraction cache in app.services.recipe_populator."""
+
+import httpx
+import pytest
+
+from app.services.cache import cache_key, get_failed_extraction_cache
+from app.services.extractors.base import ExtractionResult
+from app.services.recipe_populator import RecipePopulator, TheMealDBMeal
+
+
+class StubExtractor:
+    def __init__(self, result: ExtractionResult) -> None:
+        self.result = result
+        self.urls: list[str] = []
+
+    async def extract(self, url: str) -> ExtractionResult:
+        self.urls.append(url)
+        return self.result
+
+
+def meal(source_url: str) -> TheMealDBMeal:
+    return TheMealDBMeal(
+        id="1",
+        title="Pork Chops",
+        source_url=source_url,
+        image="https://example.com/pork.jpg",
+        category="Pork",
+        area="American",
+    )
+
+
+@pytest.mark.parametrize(
+    ("transient", "cached"),
+    [(True, False), (False, True)],
+)
+async def test_enrich_recipe_caches_only_lasting_failures(transient: bool, cached: bool) -> None:
+    url = f"https://example.com/recipe-{transient}"
+    async with httpx.AsyncClient() as client:
+        populator = RecipePopulator(http_client=client)
+        extractor = StubExtractor(
+            ExtractionResult(success=False, error="failed", transient=transient)
+        )
+        populator._extractor = extractor
+
+        assert await populator.enrich_recipe(meal(url)) is None
+
+    assert extractor.urls == [url]
+    assert (get_failed_extraction_cache().get(cache_key(url)) is not None) is cached
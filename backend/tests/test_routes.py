@@ -0,0 +1,43 @@
+"""Tests for the SSE helpers in app.api.routes."""
+
+import asyncio
+import inspect
+from collections.abc import Iterator
+
+import pytest
+
+from app.api.routes import (
+    SSEProgressEvent,
+    _drop_oldest_update,
+    extraction_event_generator,
+    sse_response,
+)
+
+
+async def test_extraction_event_generator_is_async_generator() -> None:
+    events = extraction_event_generator("https://example.com/recipe")
+    try:
+        assert inspect.isasyncgen(events)
+    finally:
+        await events.aclose()
+
+
+def test_sse_response_rejects_sync_generator() -> None:
+    def events() -> Iterator[bytes]:
+        yield b"event: progress\ndata: {}\n\n"
+
+    with pytest.raises(TypeError):
+        sse_response(events())
+
+
+def test_drop_oldest_update_keeps_tier_switches() -> None:
+    queue: asyncio.Queue[tuple[SSEProgressEvent, bool]] = asyncio.Queue(maxsize=3)
+    switch = (SSEProgressEvent(message="Trying audio", percent=0.3, tier="audio"), True)
+    first = (SSEProgressEvent(message="Downloading", percent=0.4, tier="audio"), False)
+    second = (SSEProgressEvent(message="Transcribing", percent=0.5, tier="audio"), False)
+    for update in (switch, first, second):
+        queue.put_nowait(update)
+
+    _drop_oldest_update(queue)
+
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [switch, second]